@@ -0,0 +1,38 @@
+"""
+Per-construction cost of the IPv4Network inits.
+
+Run with `PYTHONPATH=. python benchmarks/bench_construction.py` from the repository root.
+"""
+
+import timeit
+
+from nettools import IPv4Network, IPv4NetworkCompound, FourBytesLiteral
+
+
+NUMBER = 20000
+
+ip_fbl = FourBytesLiteral().set_eval('10.1.2.3')
+mask_fbl = FourBytesLiteral().set_eval('255.255.0.0')
+
+CASES = [
+    ("init_from_couple (length)", lambda: IPv4Network().init_from_couple('10.1.2.3', 16)),
+    ("init_from_couple (literal)", lambda: IPv4Network().init_from_couple('10.1.2.3', '255.255.0.0')),
+    ("init_from_cidr", lambda: IPv4Network().init_from_cidr('10.1.2.3/16')),
+    ("init_from_fbl", lambda: IPv4Network().init_from_fbl(ip_fbl, mask_fbl)),
+    ("init_from_prefix", lambda: IPv4Network().init_from_prefix('10.1.2.3', 16)),
+    ("init_from_int", lambda: IPv4Network().init_from_int(0x0A010203, 16)),
+]
+
+
+def main():
+    for name, case in CASES:
+        total = timeit.timeit(case, number=NUMBER)
+        print(f"{name:<30} {total / NUMBER * 1e6:8.2f} us/network")
+
+    total = timeit.timeit(lambda: IPv4NetworkCompound().init_from_cidr('10.0.0.0/8').add_from_addresses([250] * 1000),
+                          number=10)
+    print(f"{'compound of 1000 subnets':<30} {total / 10 / 1000 * 1e6:8.2f} us/subnet")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Lookup throughput of RoutingTable.
+
+Run with `PYTHONPATH=. python benchmarks/bench_routing_table.py` from the repository root.
+"""
+
+import time
+
+import numpy as np
+
+from nettools import RoutingTable, FrozenIPv4Network
+
+
+ROUTES = 50000
+SINGLE_LOOKUPS = 100000
+BATCH_LOOKUPS = 1000000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    table = RoutingTable()
+
+    lengths = rng.integers(8, 29, ROUTES)
+    networks = rng.integers(0, 2 ** 32, ROUTES, dtype=np.uint64)
+
+    start = time.perf_counter()
+    for network, length in zip(networks.tolist(), lengths.tolist()):
+        table.insert(FrozenIPv4Network(network, length), length)
+    elapsed = time.perf_counter() - start
+    print(f"insert        {ROUTES / elapsed:12,.0f} routes/s ({len(table)} routes)")
+
+    ips = rng.integers(0, 2 ** 32, BATCH_LOOKUPS, dtype=np.uint64).astype(np.uint32)
+
+    start = time.perf_counter()
+    for ip in ips[:SINGLE_LOOKUPS].tolist():
+        table.lookup(ip)
+    elapsed = time.perf_counter() - start
+    print(f"single lookup {SINGLE_LOOKUPS / elapsed:12,.0f} lookups/s")
+
+    # First batch includes building the lookup intervals
+    table.lookup_batch(ips[:1])
+    start = time.perf_counter()
+    table.lookup_batch(ips)
+    elapsed = time.perf_counter() - start
+    print(f"batch lookup  {BATCH_LOOKUPS / elapsed:12,.0f} lookups/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,42 @@
 from .core.ipv4_network import *
-from .core.ipv4_network_compound import IPv4NetworkCompound
+from .core.ipv4_network_compound import IPv4NetworkCompound, CompoundStats, SubnetUsage
+from .core.frozen_ipv4_network import FrozenIPv4Network
+from .core.buddy_allocator import BuddyAllocator
+from .core.renderers import render
 
-from .utils.ip_class import FourBytesLiteral, LimitedList
+from .utils.ip_class import FourBytesLiteral, LimitedList, IPv4Address
 from .utils.errors import *
 from .utils.utils import Utils
+from .utils.network_cache import NetworkCache
+
+# The NumPy-backed classes and functions are imported on first access, so that importing the package (and the CLI)
+# does not load NumPy. As they are not loaded yet, they are left out of `from nettools import *`
+_LAZY_IMPORTS = {
+    'RoutingTable': '.core.routing_table',
+    'collapse': '.core.aggregation',
+    'collapse_arrays': '.core.aggregation',
+    'summarize': '.core.aggregation',
+    'IPv4AddressSet': '.core.ipv4_address_set',
+    'OverlapIndex': '.core.overlap_index',
+    'plan_subnets': '.core.subnet_planner',
+    'plan_capacities': '.core.subnet_planner',
+    'SubnetPlan': '.core.subnet_planner',
+    'CapacityPlan': '.core.subnet_planner',
+    'IPv4AddressArray': '.core.ipv4_array',
+    'IPv4NetworkArray': '.core.ipv4_array',
+    'BulkParser': '.utils.bulk_parser',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -1,10 +1,23 @@
 import argparse
-from nettools.core.ipv4_network import IPv4NetworkDisplayer
+import sys
+from nettools.core.ipv4_network import IPv4Network, IPv4NetworkDisplayer
 from nettools.core.ipv4_network_compound import IPv4NetworkCompound
 
+# Kept in sync with nettools.core.batch.BATCH_FORMATS, which is only imported by the batch subcommand
+BATCH_FORMATS = ('ndjson', 'csv')
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a number of at least 1, found {value}")
+    return number
+
 
 def main():
     parser = argparse.ArgumentParser()
+    parser.add_argument("--cache", help="Caches up to SIZE constructed networks, reusing them for repeated queries",
+                        type=positive_int, metavar="SIZE")
     subparsers = parser.add_subparsers(dest="subparser", help="Sub-modules")
 
     # network parser
@@ -29,19 +42,73 @@ def main():
     group.add_argument("-A", "--advanced", help="Displays more informations about how the utils are composed, and "
                                                 "also some advices on the masks that can be used", action="store_true")
 
+    # batch parser
+    batch_parser = subparsers.add_parser("batch", help="Answers one network or builder query per line of a file or "
+                                                       "of the standard input")
+    batch_parser.add_argument("file", help="File to read the queries from, - for the standard input", nargs='?',
+                              default='-')
+    batch_parser.add_argument("-f", "--format", help="Output format", choices=BATCH_FORMATS, default='ndjson')
+    batch_parser.add_argument("-j", "--jobs", help="Number of worker processes", type=positive_int, default=1,
+                              metavar="N")
+
+    # daemon parsers
+    serve_parser = subparsers.add_parser("serve", help="Answers batch queries on a Unix socket until interrupted")
+    serve_parser.add_argument("socket", help="Path of the Unix socket to listen on")
+    serve_parser.add_argument("--size", help="Number of answers kept in memory", type=positive_int, default=4096)
+
+    client_parser = subparsers.add_parser("client", help="Sends queries to a server started with serve")
+    client_parser.add_argument("socket", help="Path of the Unix socket of the server")
+    client_parser.add_argument("query", help="One batch query, e.g. \"192.168.1.4 24\". Queries are read from the "
+                                             "standard input if omitted", nargs='*')
+
     args = parser.parse_args()
 
+    if args.subparser in ["serve", "client"]:
+        import socket
+
+        if not hasattr(socket, 'AF_UNIX'):
+            parser.error(f"{args.subparser} needs Unix sockets, which are not supported on this platform")
+
+    if args.cache:
+        IPv4Network.enable_cache(args.cache)
+
     if args.subparser in ["network", "net"]:
         net = IPv4NetworkDisplayer().init_from_couple(args.ip, args.mask)
         net.display_type(display=args.raw)
 
-    elif args.subparser in ["subnet", "snb"]:
+    elif args.subparser in ["builder", "snb"]:
         net = IPv4NetworkCompound().init_from_couple(args.ip, args.mask).add_from_addresses(args.subnets_sizes)
         if not args.raw:
             net.print_subnetworks_fancy(advanced=args.advanced)
         else:
             net.print_subnetworks()
 
+    elif args.subparser == "batch":
+        from nettools.core.batch import run_batch
+
+        # Undecodable bytes are replaced, so that their line is reported as a bad query instead of stopping the run
+        options = dict(jobs=args.jobs, cache_size=args.cache)
+        if args.file == '-':
+            sys.stdin.reconfigure(errors='replace')
+            bad_lines = run_batch(sys.stdin, sys.stdout, args.format, sys.stderr, **options)
+        else:
+            with open(args.file, errors='replace') as queries:
+                bad_lines = run_batch(queries, sys.stdout, args.format, sys.stderr, **options)
+
+        if bad_lines:
+            sys.exit(1)
+
+    elif args.subparser == "serve":
+        from nettools.core.daemon import serve
+
+        serve(args.socket, args.size)
+
+    elif args.subparser == "client":
+        from nettools.core.daemon import query
+
+        for answer in query(args.socket, [" ".join(args.query)] if args.query else sys.stdin):
+            print(answer)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,123 @@
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.core.ipv4_array import IPv4NetworkArray, MASKS
+from nettools.core.ipv4_network import IPv4Network
+from nettools.utils.ip_class import literal_to_int, IPV4_MAX
+from typing import Iterable, List, Tuple, Union
+import numpy as np
+
+
+NetworkLike = Union[IPv4Network, FrozenIPv4Network, str]
+
+
+def networks_to_bounds(networks: Union[IPv4NetworkArray, Iterable[NetworkLike]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts networks (objects, CIDR strings or an IPv4NetworkArray) into int64 arrays of inclusive bounds
+    """
+
+    if isinstance(networks, IPv4NetworkArray):
+        netr = networks.network_range
+        return netr['start'].astype(np.int64), netr['end'].astype(np.int64)
+
+    bounds = []
+    for network in networks:
+        if isinstance(network, str):
+            network = FrozenIPv4Network.from_cidr(network)
+        bounds.append(network.network_bounds)
+
+    bounds = np.array(bounds, dtype=np.int64).reshape(-1, 2)
+    return bounds[:, 0], bounds[:, 1]
+
+
+def merge_intervals(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sorts inclusive intervals and merges the overlapping and adjacent ones in a single sweep
+    """
+
+    if not len(starts):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    order = np.argsort(starts, kind='stable')
+    starts, ends = starts[order].astype(np.int64), ends[order].astype(np.int64)
+
+    # An interval opens a new group when it starts after the end of everything seen before it, plus one
+    reach = np.maximum.accumulate(ends)
+    opens = np.empty(len(starts), dtype=bool)
+    opens[0] = True
+    opens[1:] = starts[1:] > reach[:-1] + 1
+
+    group_starts = np.flatnonzero(opens)
+    group_ends = np.append(group_starts[1:], len(starts)) - 1
+    return starts[group_starts], reach[group_ends]
+
+
+def intervals_to_prefixes(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Splits disjoint inclusive intervals into the minimal list of aligned prefixes covering them
+
+    :return: uint32 network addresses and uint8 prefix lengths, sorted by network address
+    """
+
+    current, ends = np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)
+    networks, lengths = [], []
+
+    # Each round takes the largest aligned block at the start of every interval, at most 32 rounds per interval
+    while len(current):
+        alignment = current & -current
+        alignment[current == 0] = 1 << 32
+        _, span_exponent = np.frexp((ends - current + 1).astype(np.float64))
+        size = np.minimum(alignment, np.int64(1) << (span_exponent.astype(np.int64) - 1))
+
+        _, size_exponent = np.frexp(size.astype(np.float64))
+        networks.append(current)
+        lengths.append(33 - size_exponent)
+
+        current = current + size
+        left = current <= ends
+        current, ends = current[left], ends[left]
+
+    if not networks:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint8)
+
+    networks, lengths = np.concatenate(networks), np.concatenate(lengths)
+    order = np.argsort(networks, kind='stable')
+    return networks[order].astype(np.uint32), lengths[order].astype(np.uint8)
+
+
+def collapse_arrays(networks: np.ndarray, prefix_lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collapses adjacent and overlapping prefixes given as arrays into the minimal covering set
+
+    :return: uint32 network addresses and uint8 prefix lengths, sorted by network address
+    """
+
+    masks = MASKS[np.asarray(prefix_lengths, dtype=np.uint8)]
+    starts = np.asarray(networks, dtype=np.uint32) & masks
+    ends = starts | ~masks
+
+    return intervals_to_prefixes(*merge_intervals(starts.astype(np.int64), ends.astype(np.int64)))
+
+
+def collapse(networks: Union[IPv4NetworkArray, Iterable[NetworkLike]]) -> List[FrozenIPv4Network]:
+    """
+    Collapses adjacent and overlapping networks into the minimal covering set of networks
+    """
+
+    starts, ends = networks_to_bounds(networks)
+    return to_frozen_networks(*intervals_to_prefixes(*merge_intervals(starts, ends)))
+
+
+def summarize(start: Union[int, str], end: Union[int, str]) -> List[FrozenIPv4Network]:
+    """
+    Minimal list of networks exactly covering the addresses from start to end, both included
+    """
+
+    start = literal_to_int(start) if isinstance(start, str) else int(start)
+    end = literal_to_int(end) if isinstance(end, str) else int(end)
+    if not (0 <= start <= end <= IPV4_MAX):
+        raise ValueError("Summarized range must be ordered and within the IPv4 range")
+
+    return to_frozen_networks(*intervals_to_prefixes(np.array([start]), np.array([end])))
+
+
+def to_frozen_networks(networks: np.ndarray, prefix_lengths: np.ndarray) -> List[FrozenIPv4Network]:
+    return [FrozenIPv4Network(n, l) for n, l in zip(networks.tolist(), prefix_lengths.tolist())]
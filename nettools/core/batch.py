@@ -0,0 +1,176 @@
+from nettools.core.ipv4_network import IPv4Network
+from nettools.core.ipv4_network_compound import IPv4NetworkCompound
+from nettools.core.parallel import iter_chunks, ordered_map
+from nettools.core.renderers import iter_records, write_chunks
+from nettools.utils.ip_class import int_to_literal
+from typing import Callable, Dict, Iterable, Iterator, List, TextIO, Tuple, Union
+import json
+
+
+BATCH_FORMATS = ('ndjson', 'csv')
+BATCH_CSV_COLUMNS = ('line', 'query', 'network', 'start', 'end', 'mask_length', 'addresses', 'address_type',
+                     'requested')
+
+NETWORK_KEYWORDS = ('network', 'net')
+BUILDER_KEYWORDS = ('builder', 'snb')
+
+
+def parse_query(line: str) -> Union[IPv4Network, IPv4NetworkCompound, None]:
+    """
+    Builds the network of a batch line. Lines are an "ip mask" couple or a CIDR, optionally prefixed by "network",
+    or a builder spec: "builder ip mask size [size ...]" or "builder cidr size [size ...]".
+    Blank lines and lines starting with # are skipped
+
+    :return: an IPv4Network, an IPv4NetworkCompound for builder specs, None for skipped lines
+    :raises:
+        ValueError: If the line does not match any query
+        Any exception of the network inits
+    """
+
+    tokens = line.split()
+    if not tokens or tokens[0].startswith('#'):
+        return None
+
+    if tokens[0] in BUILDER_KEYWORDS:
+        if len(tokens) > 1 and '/' in tokens[1]:
+            compound, sizes = IPv4NetworkCompound().init_from_cidr(tokens[1]), tokens[2:]
+        elif len(tokens) > 2:
+            compound, sizes = IPv4NetworkCompound().init_from_couple(tokens[1], tokens[2]), tokens[3:]
+        else:
+            raise ValueError("Builder spec needs a network")
+
+        if not sizes:
+            raise ValueError("Builder spec needs at least one subnet size")
+        return compound.add_from_addresses([int(size) for size in sizes])
+
+    if tokens[0] in NETWORK_KEYWORDS:
+        tokens = tokens[1:]
+
+    if len(tokens) == 1 and '/' in tokens[0]:
+        return IPv4Network().init_from_cidr(tokens[0])
+    if len(tokens) == 2:
+        return IPv4Network().init_from_couple(tokens[0], tokens[1])
+
+    raise ValueError(f"Expected an ip and a mask, a CIDR or a builder spec, found {len(tokens)} fields")
+
+
+def query_records(network: Union[IPv4Network, IPv4NetworkCompound], line_number: Union[int, None]) -> List[Dict]:
+    """
+    Flat records of a query: one for a network, one per subnet for a compound. Records have no line field when
+    the line number is None
+    """
+
+    records = _query_records(network, line_number)
+    if line_number is None:
+        for record in records:
+            del record['line']
+    return records
+
+
+def _query_records(network: Union[IPv4Network, IPv4NetworkCompound], line_number: Union[int, None]) -> List[Dict]:
+    start, end = network.network_bounds
+    cidr = f"{int_to_literal(start)}/{network.mask_length}"
+
+    if isinstance(network, IPv4NetworkCompound):
+        return [{'line': line_number, 'query': 'builder', 'network': cidr, 'start': record['start'],
+                 'end': record['end'], 'mask_length': record['mask_length'], 'addresses': record['available'],
+                 'address_type': None, 'requested': record['requested']} for record in iter_records(network)]
+
+    return [{'line': line_number, 'query': 'network', 'network': cidr, 'start': int_to_literal(start),
+             'end': int_to_literal(end), 'mask_length': network.mask_length, 'addresses': network.addresses,
+             'address_type': network.displayable_address_type, 'requested': None}]
+
+
+def iter_results(lines: Iterable[str], first_line: int = 1) -> Iterator[Tuple[int, Union[List[Dict], str]]]:
+    """
+    Yields (line number, records) for each query of the lines, or (line number, error message) for the bad ones.
+    A bad line never stops the iteration
+    """
+
+    for line_number, line in enumerate(lines, first_line):
+        try:
+            network = parse_query(line)
+        except Exception as e:
+            yield line_number, str(e) or e.__class__.__name__
+            continue
+
+        if network is not None:
+            yield line_number, query_records(network, line_number)
+
+
+def iter_batch(lines: Iterable[str], fmt: str = 'ndjson', on_error: Callable[[int, str], None] = None,
+               header: bool = True, first_line: int = 1) -> Iterator[str]:
+    """
+    Yields the output chunks of a batch, one line per record. Bad lines are passed to on_error with their message
+    """
+
+    if fmt not in BATCH_FORMATS:
+        raise ValueError(f"Unknown format {fmt}, expected one of {', '.join(BATCH_FORMATS)}")
+
+    if fmt == 'csv' and header:
+        yield ','.join(BATCH_CSV_COLUMNS) + '\n'
+
+    for line_number, result in iter_results(lines, first_line):
+        if isinstance(result, str):
+            if on_error is not None:
+                on_error(line_number, result)
+            continue
+
+        for record in result:
+            if fmt == 'ndjson':
+                yield json.dumps(record) + '\n'
+            else:
+                yield ','.join('' if record[c] is None else str(record[c]) for c in BATCH_CSV_COLUMNS) + '\n'
+
+
+def run_batch(lines: Iterable[str], stream: TextIO, fmt: str = 'ndjson', errors: TextIO = None, jobs: int = 1,
+              chunk_size: int = 10000, cache_size: int = None) -> int:
+    """
+    Answers every query of the lines, streaming the records to a file-like object through a single buffer.
+    Bad lines are written to the errors stream as "line N: message"
+
+    :param jobs: number of worker processes. With more than one, lines are sent to the workers by lists of
+        chunk_size lines, and the outputs are written back in the order of the lines
+    :param cache_size: if given, enables the network cache (see IPv4Network.enable_cache) in the worker processes
+    :return: the number of bad lines
+    :raises:
+        ValueError: If the format is unknown or jobs is less than 1
+    """
+
+    if fmt not in BATCH_FORMATS:
+        raise ValueError(f"Unknown format {fmt}, expected one of {', '.join(BATCH_FORMATS)}")
+    if jobs < 1:
+        raise ValueError(f"Expected at least 1 job, found {jobs}")
+
+    bad_lines = 0
+
+    def report(line_number: int, message: str) -> None:
+        nonlocal bad_lines
+        bad_lines += 1
+        if errors is not None:
+            errors.write(f"line {line_number}: {message}\n")
+
+    if jobs == 1:
+        write_chunks(iter_batch(lines, fmt, report), stream)
+        return bad_lines
+
+    def chunks() -> Iterator[str]:
+        if fmt == 'csv':
+            yield ','.join(BATCH_CSV_COLUMNS) + '\n'
+
+        tasks = ((chunk, fmt, 1 + i * chunk_size) for i, chunk in enumerate(iter_chunks(lines, chunk_size)))
+        initializer = IPv4Network.enable_cache if cache_size else None
+
+        for output, chunk_errors in ordered_map(_batch_chunk, tasks, jobs, initializer, (cache_size,)):
+            for line_number, message in chunk_errors:
+                report(line_number, message)
+            yield output
+
+    write_chunks(chunks(), stream)
+    return bad_lines
+
+
+def _batch_chunk(lines: List[str], fmt: str, first_line: int) -> Tuple[str, List[Tuple[int, str]]]:
+    errors = []
+    output = ''.join(iter_batch(lines, fmt, lambda n, m: errors.append((n, m)), False, first_line))
+    return output, errors
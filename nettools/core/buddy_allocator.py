@@ -0,0 +1,238 @@
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.utils.errors import NoFreeBlockException, BlockNotAllocatedException
+from nettools.utils.ip_class import int_to_literal
+from nettools.utils.utils import Utils
+from typing import Dict, List, Set, Tuple
+import heapq
+
+
+class BuddyAllocator:
+    """
+    Buddy allocator of aligned blocks over a network, blocks being subnets of 2 ** order addresses.
+
+    Free blocks are kept in one set and one min-heap per order, so the lowest free block of an order is found in
+    O(log n) and a block is always carved from the smallest free block able to hold it. Freed blocks are merged
+    with their buddy as long as it is free too. Addresses are handled as integers.
+    """
+
+    __start: int = 0
+    __order: int = 0
+
+    __free: List[Set[int]] = None
+    __heaps: List[List[int]] = None
+    __allocated: Dict[int, int] = None
+
+    __free_addresses: int = 0
+
+    def __init__(self, start: int, prefix_length: int) -> None:
+        self.__order = 32 - prefix_length
+        self.__start = start & Utils.masks_by_length[prefix_length]
+
+        self.__free = [set() for _ in range(33)]
+        self.__heaps = [[] for _ in range(33)]
+        self.__allocated = {}
+
+        self.__push(self.__start, self.__order)
+        self.__free_addresses = 1 << self.__order
+
+    #
+    # Properties
+    #
+    @property
+    def network(self) -> FrozenIPv4Network:
+        return FrozenIPv4Network(self.__start, 32 - self.__order)
+
+    @property
+    def total_addresses(self) -> int:
+        return 1 << self.__order
+
+    @property
+    def free_addresses(self) -> int:
+        return self.__free_addresses
+
+    @property
+    def allocated_addresses(self) -> int:
+        return (1 << self.__order) - self.__free_addresses
+
+    @property
+    def largest_free_block(self) -> int:
+        """
+        Number of addresses of the largest free block, 0 if the network is full
+        """
+
+        for order in range(self.__order, -1, -1):
+            if self.__free[order]:
+                return 1 << order
+        return 0
+
+    @property
+    def fragmentation(self) -> float:
+        """
+        Share of the free addresses that are outside of the largest free block, from 0 (a single free block)
+        to almost 1 (only scattered single addresses)
+        """
+
+        if not self.__free_addresses:
+            return 0.0
+        return (self.__free_addresses - self.largest_free_block) / self.__free_addresses
+
+    @property
+    def free_blocks(self) -> List[Tuple[int, int]]:
+        """
+        Free blocks as (start, prefix length) couples, sorted by address
+        """
+
+        return sorted((start, 32 - order) for order in range(self.__order + 1) for start in self.__free[order])
+
+    @property
+    def allocated_blocks(self) -> List[Tuple[int, int]]:
+        return sorted((start, 32 - order) for start, order in self.__allocated.items())
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__allocated)
+
+    def __contains__(self, start: int) -> bool:
+        return start in self.__allocated
+
+    def fitting_block(self, prefix_length: int) -> int:
+        """
+        Number of addresses of the free block a /prefix_length allocation would be carved from, 0 if none fits
+        """
+
+        order = 32 - prefix_length
+        for available in range(max(order, 0), self.__order + 1):
+            if self.__free[available]:
+                return 1 << available
+        return 0
+
+    #
+    # Allocation
+    #
+    def allocate(self, size: int) -> int:
+        """
+        Allocates the smallest subnet able to hold `size` computer addresses
+
+        :return: the network address of the allocated block
+        :raises:
+            NoFreeBlockException: If no free block is large enough
+        """
+
+        return self.allocate_prefix(32 - Utils.required_machine_bits(size))
+
+    def allocate_prefix(self, prefix_length: int) -> int:
+        """
+        Allocates a /prefix_length block, carved from the smallest free block able to hold it, lowest address first
+
+        :return: the network address of the allocated block
+        :raises:
+            NoFreeBlockException: If no free block is large enough
+        """
+
+        order = 32 - prefix_length
+        if not (0 <= order <= self.__order):
+            raise NoFreeBlockException(prefix_length)
+
+        for available in range(order, self.__order + 1):
+            if self.__free[available]:
+                break
+        else:
+            raise NoFreeBlockException(prefix_length)
+
+        start = self.__pop(available)
+
+        # Keep the lower half, the upper halves become free blocks
+        while available > order:
+            available -= 1
+            self.__push(start + (1 << available), available)
+
+        self.__allocated[start] = order
+        self.__free_addresses -= 1 << order
+        return start
+
+    def reserve(self, start: int, prefix_length: int) -> int:
+        """
+        Allocates the given block, which must be free
+
+        :return: the network address of the allocated block
+        :raises:
+            NoFreeBlockException: If the block is not entirely free
+        """
+
+        order = 32 - prefix_length
+        if not (0 <= order <= self.__order) or start & ((1 << order) - 1):
+            raise NoFreeBlockException(prefix_length)
+
+        # Find the free block containing the requested one
+        for available in range(order, self.__order + 1):
+            container = start & ~((1 << available) - 1)
+            if container in self.__free[available]:
+                break
+        else:
+            raise NoFreeBlockException(prefix_length)
+
+        self.__remove(container, available)
+
+        # Split towards the requested block, freeing the halves that do not contain it
+        while available > order:
+            available -= 1
+            half = 1 << available
+            if start & half:
+                self.__push(container, available)
+                container += half
+            else:
+                self.__push(container + half, available)
+
+        self.__allocated[start] = order
+        self.__free_addresses -= 1 << order
+        return start
+
+    def free(self, start: int) -> None:
+        """
+        Frees an allocated block, merging it with its free buddies
+
+        :raises:
+            BlockNotAllocatedException: If no block was allocated at this address
+        """
+
+        order = self.__allocated.pop(start, None)
+        if order is None:
+            raise BlockNotAllocatedException(int_to_literal(start))
+        self.__free_addresses += 1 << order
+
+        while order < self.__order:
+            buddy = start ^ (1 << order)
+            if buddy not in self.__free[order]:
+                break
+            self.__remove(buddy, order)
+            start &= ~(1 << order)
+            order += 1
+
+        self.__push(start, order)
+
+    #
+    # Helpers
+    #
+    def __push(self, start: int, order: int) -> None:
+        heap, free = self.__heaps[order], self.__free[order]
+        free.add(start)
+        heapq.heappush(heap, start)
+
+        # Drop the stale entries once they outnumber the live ones, keeping the heap size linear
+        if len(heap) > 2 * len(free) + 32:
+            heap[:] = list(free)
+            heapq.heapify(heap)
+
+    def __remove(self, start: int, order: int) -> None:
+        # The heap entry is left behind and skipped when it reaches the top
+        self.__free[order].discard(start)
+
+    def __pop(self, order: int) -> int:
+        heap, free = self.__heaps[order], self.__free[order]
+        while True:
+            start = heapq.heappop(heap)
+            if start in free:
+                free.discard(start)
+                return start
@@ -0,0 +1,112 @@
+from nettools.core.batch import parse_query, query_records
+from nettools.core.ipv4_network import IPv4Network
+from nettools.utils.network_cache import NetworkCache
+from typing import Iterable, Iterator
+import json
+import os
+import socket
+import socketserver
+import stat
+
+
+class NetToolsServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Long-running server answering batch queries (see batch.parse_query) on a Unix socket.
+
+    Clients send one query per line and receive one JSON line per query, either {"records": [...]} or
+    {"error": "message"}. Answers are cached by query, so repeated queries skip parsing and building entirely.
+    """
+
+    daemon_threads = True
+
+    __responses: NetworkCache = None
+
+    def __init__(self, path: str, cache_size: int = 4096) -> None:
+        if os.path.lexists(path):
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            if _is_listening(path):
+                raise OSError(f"A server is already listening on {path}")
+            os.unlink(path)
+
+        self.__responses = NetworkCache(cache_size)
+        super().__init__(path, _QueryHandler)
+
+    @property
+    def responses(self) -> NetworkCache:
+        return self.__responses
+
+    def answer(self, query: str) -> bytes:
+        """
+        JSON line answering a query, newline included
+        """
+
+        query = query.strip()
+        response = self.__responses.get(query)
+        if response is not None:
+            return response
+
+        try:
+            network = parse_query(query)
+            payload = {'records': query_records(network, None) if network is not None else []}
+        except Exception as e:
+            payload = {'error': str(e) or e.__class__.__name__}
+
+        response = (json.dumps(payload) + '\n').encode()
+        self.__responses.put(query, response)
+        return response
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            # Undecodable bytes are replaced, so that the query gets an error answer like any other bad query
+            self.wfile.write(self.server.answer(line.decode(errors='replace')))
+            self.wfile.flush()
+
+
+def _is_listening(path: str) -> bool:
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def serve(path: str, cache_size: int = 4096) -> None:
+    """
+    Serves queries on a Unix socket until interrupted. The network cache (see IPv4Network.enable_cache) is enabled
+    too, so queries sharing their network with a previous one are answered without building it again
+    """
+
+    if IPv4Network.cache() is None:
+        IPv4Network.enable_cache(cache_size)
+
+    with NetToolsServer(path, cache_size) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def query(path: str, queries: Iterable[str]) -> Iterator[str]:
+    """
+    Sends queries to a server and yields its JSON answers, one per query
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        answers = client.makefile('rb')
+
+        for line in queries:
+            client.sendall(line.rstrip('\n').encode() + b'\n')
+            yield answers.readline().decode().rstrip('\n')
@@ -0,0 +1,131 @@
+from nettools.core.ipv4_network import IPv4Network
+from nettools.utils.errors import MaskNotProvided
+from nettools.utils.ip_class import IPv4Address, IPV4_MAX, literal_to_int, int_to_literal
+from nettools.utils.utils import Utils
+from functools import total_ordering
+from typing import Tuple, Union
+
+
+@total_ordering
+class FrozenIPv4Network:
+    """
+    Immutable and hashable network value, holding only the network address integer and the prefix length.
+
+    Equality, hash and ordering are keyed on (network, prefix length), so instances can be deduplicated, sorted,
+    used as dict keys and shared between threads without copying. Host bits of the given IP are dropped.
+    Unlike IPv4Network, RFC 1918 rules are not enforced on frozen networks.
+    """
+
+    __slots__ = ('__network', '__prefix_length')
+
+    # Dunders
+    def __init__(self, ip: int, prefix_length: Union[int, str]) -> None:
+        if not isinstance(prefix_length, int) or not (0 <= prefix_length <= 32):
+            prefix_length = Utils.mask_to_length(prefix_length)
+        if not (0 <= ip <= IPV4_MAX):
+            raise ValueError(f"IPv4 address integer must be between 0 and {IPV4_MAX}, found {ip}")
+
+        object.__setattr__(self, '_FrozenIPv4Network__network', ip & Utils.masks_by_length[prefix_length])
+        object.__setattr__(self, '_FrozenIPv4Network__prefix_length', prefix_length)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("FrozenIPv4Network instances are immutable")
+
+    def __delattr__(self, item):
+        raise AttributeError("FrozenIPv4Network instances are immutable")
+
+    def __reduce__(self):
+        return FrozenIPv4Network, (self.__network, self.__prefix_length)
+
+    def __hash__(self):
+        return hash((self.__network, self.__prefix_length))
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenIPv4Network):
+            return self.__network == other.__network and self.__prefix_length == other.__prefix_length
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, FrozenIPv4Network):
+            return (self.__network, self.__prefix_length) < (other.__network, other.__prefix_length)
+        return NotImplemented
+
+    def __contains__(self, ip: Union[int, str, IPv4Address]) -> bool:
+        value = literal_to_int(ip) if isinstance(ip, str) else int(ip)
+        return self.__network <= value <= self.broadcast_int
+
+    def __len__(self) -> int:
+        return 1 << (32 - self.__prefix_length)
+
+    def __str__(self):
+        return f"{int_to_literal(self.__network)}/{self.__prefix_length}"
+
+    def __repr__(self):
+        return f"FrozenIPv4Network('{self}')"
+
+    # Properties
+    @property
+    def network(self) -> IPv4Address:
+        return IPv4Address(self.__network)
+
+    @property
+    def network_int(self) -> int:
+        return self.__network
+
+    @property
+    def broadcast(self) -> IPv4Address:
+        return IPv4Address(self.broadcast_int)
+
+    @property
+    def broadcast_int(self) -> int:
+        return self.__network | (Utils.masks_by_length[self.__prefix_length] ^ IPV4_MAX)
+
+    @property
+    def prefix_length(self) -> int:
+        return self.__prefix_length
+
+    @property
+    def mask(self) -> IPv4Address:
+        return IPv4Address(Utils.masks_by_length[self.__prefix_length])
+
+    @property
+    def network_bounds(self) -> Tuple[int, int]:
+        return self.__network, self.broadcast_int
+
+    @property
+    def addresses(self) -> int:
+        return 2 ** (32 - self.__prefix_length) - 2
+
+    # Constructors
+    @staticmethod
+    def from_cidr(cidr: str):
+        try:
+            ip, mask = cidr.split('/')
+        except ValueError:
+            raise MaskNotProvided(cidr)
+
+        return FrozenIPv4Network(literal_to_int(ip), Utils.mask_to_length(mask))
+
+    @staticmethod
+    def from_couple(ip: str, mask: Union[str, int]):
+        return FrozenIPv4Network(literal_to_int(ip), Utils.mask_to_length(mask))
+
+    @staticmethod
+    def from_network(network: IPv4Network):
+        return FrozenIPv4Network(network.network_bounds[0], network.mask_length)
+
+    @staticmethod
+    def coerce(network: Union['FrozenIPv4Network', IPv4Network, str]):
+        """
+        Returns frozen networks as is, and converts IPv4Network instances and CIDR strings
+        """
+
+        if isinstance(network, FrozenIPv4Network):
+            return network
+        elif isinstance(network, IPv4Network):
+            return FrozenIPv4Network.from_network(network)
+        return FrozenIPv4Network.from_cidr(network)
+
+    # Conversions
+    def to_network(self) -> IPv4Network:
+        return IPv4Network().init_from_int(self.__network, self.__prefix_length)
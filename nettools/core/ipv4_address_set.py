@@ -0,0 +1,192 @@
+from nettools.core.aggregation import NetworkLike, networks_to_bounds, merge_intervals, intervals_to_prefixes, \
+    to_frozen_networks
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.utils.ip_class import literal_to_int, IPV4_MAX
+from nettools.utils.utils import Utils
+from typing import Callable, Iterable, List, Tuple, Union
+import numpy as np
+
+
+class IPv4AddressSet:
+    """
+    Immutable set of IPv4 addresses, stored as sorted, disjoint and non-adjacent inclusive intervals
+    in two uint32 arrays.
+
+    Set operations walk the interval bounds of both operands in a single merge pass. The operators |, &, - and ^
+    are available, as well as <=, >= and == for inclusion and equality.
+    """
+
+    __slots__ = ('__starts', '__ends')
+
+    def __init__(self, networks: Iterable[NetworkLike] = ()) -> None:
+        starts, ends = networks_to_bounds(networks)
+        self.__set_intervals(*merge_intervals(starts, ends))
+
+    #
+    # Constructors
+    #
+    @staticmethod
+    def from_intervals(starts: Iterable[int], ends: Iterable[int]):
+        """
+        Builds a set from inclusive intervals, which may overlap and be unsorted
+        """
+
+        result = IPv4AddressSet()
+        result.__set_intervals(*merge_intervals(np.asarray(starts, dtype=np.int64), np.asarray(ends, dtype=np.int64)))
+        return result
+
+    @staticmethod
+    def from_range(start: Union[int, str], end: Union[int, str]):
+        start = literal_to_int(start) if isinstance(start, str) else int(start)
+        end = literal_to_int(end) if isinstance(end, str) else int(end)
+        if not (0 <= start <= end <= IPV4_MAX):
+            raise ValueError("Range must be ordered and within the IPv4 range")
+
+        return IPv4AddressSet.from_intervals([start], [end])
+
+    #
+    # Properties
+    #
+    @property
+    def intervals(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.__starts, self.__ends
+
+    @property
+    def size(self) -> int:
+        """
+        Number of addresses in the set
+        """
+
+        return int((self.__ends.astype(np.int64) - self.__starts + 1).sum())
+
+    #
+    # Dunders
+    #
+    def __bool__(self) -> bool:
+        return len(self.__starts) > 0
+
+    def __contains__(self, ip: Union[int, str]) -> bool:
+        value = literal_to_int(ip) if isinstance(ip, str) else int(ip)
+        index = int(np.searchsorted(self.__starts, value, side='right')) - 1
+        return index >= 0 and value <= self.__ends[index]
+
+    def __eq__(self, other):
+        if isinstance(other, IPv4AddressSet):
+            return np.array_equal(self.__starts, other.__starts) and np.array_equal(self.__ends, other.__ends)
+        return NotImplemented
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __xor__(self, other):
+        return self.symmetric_difference(other)
+
+    def __le__(self, other):
+        return self.issubset(other)
+
+    def __ge__(self, other):
+        return self.issuperset(other)
+
+    def __repr__(self):
+        return f"IPv4AddressSet({[str(n) for n in self.to_networks()]})"
+
+    #
+    # Set operations
+    #
+    def union(self, other: 'IPv4AddressSet') -> 'IPv4AddressSet':
+        return self.__combine(other, np.logical_or)
+
+    def intersection(self, other: 'IPv4AddressSet') -> 'IPv4AddressSet':
+        return self.__combine(other, np.logical_and)
+
+    def difference(self, other: 'IPv4AddressSet') -> 'IPv4AddressSet':
+        return self.__combine(other, lambda a, b: a & ~b)
+
+    def symmetric_difference(self, other: 'IPv4AddressSet') -> 'IPv4AddressSet':
+        return self.__combine(other, np.logical_xor)
+
+    def issubset(self, other: 'IPv4AddressSet') -> bool:
+        return not self.difference(other)
+
+    def issuperset(self, other: 'IPv4AddressSet') -> bool:
+        return not other.difference(self)
+
+    def contains(self, ips) -> np.ndarray:
+        """
+        checks which ips of a batch are in the set
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: boolean mask, True where the ip is in the set
+        """
+
+        values = Utils.to_uint32_array(ips)
+        if not len(self.__starts):
+            return np.zeros(len(values), dtype=bool)
+
+        index = np.searchsorted(self.__starts, values, side='right') - 1
+        return (index >= 0) & (values <= self.__ends[np.maximum(index, 0)])
+
+    #
+    # Conversions
+    #
+    def prefixes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Minimal list of prefixes covering exactly the set, as uint32 network addresses and uint8 prefix lengths
+        """
+
+        return intervals_to_prefixes(self.__starts.astype(np.int64), self.__ends.astype(np.int64))
+
+    def to_networks(self) -> List[FrozenIPv4Network]:
+        return to_frozen_networks(*self.prefixes())
+
+    #
+    # Helpers
+    #
+    def __set_intervals(self, starts: np.ndarray, ends: np.ndarray) -> None:
+        self.__starts = starts.astype(np.uint32)
+        self.__ends = ends.astype(np.uint32)
+
+    def __boundaries(self) -> np.ndarray:
+        """
+        Interleaved starts and exclusive ends, strictly increasing since the intervals are disjoint and non-adjacent
+        """
+
+        points = np.empty(2 * len(self.__starts), dtype=np.int64)
+        points[0::2] = self.__starts
+        points[1::2] = self.__ends.astype(np.int64) + 1
+        return points
+
+    def __combine(self, other: 'IPv4AddressSet', predicate: Callable) -> 'IPv4AddressSet':
+        mine, theirs = self.__boundaries(), other.__boundaries()
+        points = np.concatenate([mine, theirs])
+        if not len(points):
+            return IPv4AddressSet()
+
+        # +1 when entering an interval, -1 when leaving it, separately for each operand
+        deltas_a = np.zeros(len(points), dtype=np.int8)
+        deltas_a[0:len(mine):2], deltas_a[1:len(mine):2] = 1, -1
+        deltas_b = np.zeros(len(points), dtype=np.int8)
+        deltas_b[len(mine)::2], deltas_b[len(mine) + 1::2] = 1, -1
+
+        # Both halves are already sorted, so the stable sort is a linear merge of two runs
+        order = np.argsort(points, kind='stable')
+        points = points[order]
+        in_a = np.cumsum(deltas_a[order]) > 0
+        in_b = np.cumsum(deltas_b[order]) > 0
+
+        # Keep the state after the last event of each point
+        last = np.append(points[1:] != points[:-1], True)
+        points, inside = points[last], predicate(in_a[last], in_b[last])
+
+        # The state after the last point is always outside, so every opening has a closing
+        changes = np.diff(np.concatenate([[False], inside]).astype(np.int8))
+
+        result = IPv4AddressSet()
+        result.__set_intervals(points[changes == 1], points[changes == -1] - 1)
+        return result
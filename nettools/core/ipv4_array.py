@@ -0,0 +1,188 @@
+from nettools.utils.errors import MaskLengthOffBoundsException, MaskNotProvided
+from nettools.utils.ip_class import IPv4Address, literal_to_int, int_to_literal
+from nettools.utils.utils import Utils
+from typing import Iterable, Union, List, Dict
+import numpy as np
+
+
+# Masks for every prefix length, indexable by an array of lengths
+MASKS = np.array(Utils.masks_by_length, dtype=np.uint32)
+
+
+class IPv4AddressArray:
+    """
+    Columnar array of IPv4 addresses, backed by a uint32 NumPy array
+    """
+
+    __values: np.ndarray = None
+
+    #
+    # Properties
+    #
+    @property
+    def values(self) -> np.ndarray:
+        return self.__values
+
+    @property
+    def literals(self) -> List[str]:
+        return [int_to_literal(int(i)) for i in self.__values]
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.__values if dtype is None else self.__values.astype(dtype, copy=False)
+
+    def __getitem__(self, item) -> IPv4Address:
+        return IPv4Address(int(self.__values[item]))
+
+    def __iter__(self):
+        return (IPv4Address(int(i)) for i in self.__values)
+
+    #
+    # Inits
+    #
+    def init_from_literals(self, literals: Iterable[str]):
+        self.__values = np.fromiter((literal_to_int(i) for i in literals), dtype=np.uint32)
+        return self
+
+    def init_from_array(self, values: Union[np.ndarray, Iterable[int]]):
+        self.__values = np.asarray(values, dtype=np.uint32)
+        return self
+
+
+class IPv4NetworkArray:
+    """
+    Columnar array of (ip, mask length) couples, backed by uint32 and uint8 NumPy arrays.
+
+    Every property is the vectorized equivalent of the IPv4Network property of the same name,
+    computed for the whole batch at once.
+    """
+
+    __ips: np.ndarray = None
+    __mask_lengths: np.ndarray = None
+
+    __masks: np.ndarray = None
+    __starts: np.ndarray = None
+    __ends: np.ndarray = None
+
+    __activated = False
+
+    #
+    # Properties
+    #
+    @property
+    def ips(self) -> np.ndarray:
+        return self.__ips if self.__activated else None
+
+    @property
+    def mask_lengths(self) -> np.ndarray:
+        return self.__mask_lengths if self.__activated else None
+
+    @property
+    def masks(self) -> np.ndarray:
+        return self.__masks if self.__activated else None
+
+    @property
+    def network_range(self) -> Dict[str, np.ndarray]:
+        return {"start": self.__starts, "end": self.__ends} if self.__activated else None
+
+    @property
+    def addresses(self) -> np.ndarray:
+        if not self.__activated:
+            return None
+        return (np.int64(1) << (32 - self.__mask_lengths.astype(np.int64))) - 2
+
+    @property
+    def address_type(self) -> np.ndarray:
+        """
+        0 for a network address, 1 for a computer address and 2 for a broadcast address
+        """
+
+        if not self.__activated:
+            return None
+        return np.where(self.__ips == self.__starts, 0, np.where(self.__ips == self.__ends, 2, 1)).astype(np.uint8)
+
+    @property
+    def rfc_ranges(self) -> np.ndarray:
+        """
+        Index of the RFC 1918 range (in Utils.rfc_allowed_ranges) each IP belongs to, -1 if none
+        """
+
+        if not self.__activated:
+            return None
+
+        first = self.__ips >> 24
+        second = (self.__ips >> 16) & 255
+
+        result = np.full(len(self.__ips), -1, dtype=np.int8)
+        for i, (allowed, (low, high)) in enumerate(Utils.rfc_allowed_ranges):
+            result[(first == allowed) & (low <= second) & (second <= high)] = i
+        return result
+
+    @property
+    def rfc_compliant(self) -> np.ndarray:
+        """
+        Boolean mask of the couples that match RFC 1918 standards (range and mask length)
+        """
+
+        if not self.__activated:
+            return None
+
+        ranges = self.rfc_ranges
+        required = np.array(Utils.rfc_masks, dtype=np.uint8)[ranges]
+        return (ranges != -1) & (self.__mask_lengths >= required)
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__ips) if self.__activated else 0
+
+    #
+    # Inits
+    #
+    def init_from_arrays(self, ips: Union[np.ndarray, Iterable[int]], mask_lengths: Union[np.ndarray, Iterable[int]]):
+        self.__ips = np.asarray(ips, dtype=np.uint32)
+        lengths = np.asarray(mask_lengths)
+
+        if len(lengths) != len(self.__ips):
+            raise ValueError(f"Found {len(self.__ips)} IPs for {len(lengths)} masks")
+        out = (lengths < 0) | (lengths > 32)
+        if out.any():
+            raise MaskLengthOffBoundsException(lengths[out][0])
+
+        self.__mask_lengths = lengths.astype(np.uint8)
+
+        self.__flow()
+        return self
+
+    def init_from_couples(self, ips: Iterable[str], masks: Iterable[Union[str, int]]):
+        ips = [literal_to_int(i) for i in ips]
+        lengths = [Utils.mask_to_length(m) for m in masks]
+        return self.init_from_arrays(ips, lengths)
+
+    def init_from_cidrs(self, cidrs: Iterable[str]):
+        ips, lengths = [], []
+        for cidr in cidrs:
+            try:
+                ip, mask = cidr.split('/')
+            except ValueError:
+                raise MaskNotProvided(cidr)
+            ips.append(literal_to_int(ip))
+            lengths.append(Utils.mask_to_length(mask))
+
+        return self.init_from_arrays(ips, lengths)
+
+    #
+    # Flow
+    #
+    def __flow(self):
+        self.__masks = MASKS[self.__mask_lengths]
+        self.__starts = self.__ips & self.__masks
+        self.__ends = self.__starts | ~self.__masks
+
+        self.__activated = True
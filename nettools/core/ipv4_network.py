@@ -3,14 +3,21 @@ from nettools.utils.errors import MaskLengthOffBoundsException, \
     RFCRulesIPWrongRangeException, MaskNotProvided, IncorrectMaskException, BytesLengthException, \
     ByteNumberOffLimitsException
 from nettools.utils.utils import Utils
-from nettools.utils.ip_class import FourBytesLiteral
-from typing import Union, Dict
+from nettools.utils.ip_class import FourBytesLiteral, IPv4Address, IPV4_MAX, literal_to_int, int_to_literal
+from nettools.utils.network_cache import NetworkCache
+from typing import Union, Dict, Tuple, Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ['IPv4Network', 'IPv4NetworkDisplayer']
 
 
 class IPv4Network:
-    __ip: FourBytesLiteral = None
-    __mask: Union[FourBytesLiteral, str] = None
-    __network_range: Dict[str, FourBytesLiteral] = {}
+    __ip: Union[FourBytesLiteral, IPv4Address] = None
+    __mask: Union[IPv4Address, str] = None
+    __network_range: Dict[str, FourBytesLiteral] = None
+    __network_bounds: Tuple[int, int] = None
 
     __activated = False  # If IPv4Network has been initialized
 
@@ -19,6 +26,12 @@ class IPv4Network:
 
     __rfc_current_range = None
 
+    # Address types codes
+    TYPE_NETWORK, TYPE_COMPUTER, TYPE_BROADCAST, TYPE_OUTSIDE = 0, 1, 2, 3
+
+    # Opt-in cache shared by all the instances, see IPv4Network.enable_cache
+    __cache: NetworkCache = None
+
     lang_dict = {
         'network': "Network:",
         'cidr': "CIDR : {}/{}",
@@ -43,11 +56,11 @@ class IPv4Network:
     #
     @property
     def ip(self):
-        return self.__ip if self.__activated else None
+        return FourBytesLiteral().set_from_int(int(self.__ip)) if self.__activated else None
 
     @property
     def mask(self):
-        return self.__mask if self.__activated else None
+        return FourBytesLiteral().set_from_int(int(self.__mask)) if self.__activated else None
 
     @property
     def mask_length(self):
@@ -55,7 +68,17 @@ class IPv4Network:
 
     @property
     def network_range(self):
-        return self.__network_range if self.__activated else None
+        if not self.__activated:
+            return None
+        if self.__network_range is None:
+            start, end = self.__network_bounds
+            self.__network_range = {"start": FourBytesLiteral().set_from_int(start),
+                                    "end": FourBytesLiteral().set_from_int(end)}
+        return self.__network_range
+
+    @property
+    def network_bounds(self):
+        return self.__network_bounds if self.__activated else None
 
     @property
     def addresses(self):
@@ -74,7 +97,8 @@ class IPv4Network:
     #
     @property
     def displayable_network_range(self):
-        return Utils.netr_to_literal(self.__network_range)
+        start, end = self.__network_bounds
+        return {"start": int_to_literal(start), "end": int_to_literal(end)}
 
     @property
     def displayable_address_type(self):
@@ -85,6 +109,29 @@ class IPv4Network:
         ]
         return li[self.__address_type]
 
+    #
+    # Cache
+    #
+    @staticmethod
+    def enable_cache(maxsize: int = 4096, eviction: str = 'lru') -> NetworkCache:
+        """
+        Enables a cache shared by every IPv4Network (and compound) init, keyed on the normalized (ip, mask length)
+        couple. A hit skips validation, RFC checks and range computation.
+
+        :return: the cache, to read its statistics
+        """
+
+        IPv4Network.__cache = NetworkCache(maxsize, eviction)
+        return IPv4Network.__cache
+
+    @staticmethod
+    def disable_cache() -> None:
+        IPv4Network.__cache = None
+
+    @staticmethod
+    def cache() -> Union[NetworkCache, None]:
+        return IPv4Network.__cache
+
     #
     # POSSIBLE INITS (built to chain)
     #
@@ -109,19 +156,42 @@ class IPv4Network:
 
     def init_from_fbl(self, ip: FourBytesLiteral, mask: FourBytesLiteral):
         self.__ip = ip
-        self.__mask = str(mask)
+        self.__mask = mask
 
         self.__flow()
         return self
 
+    def init_from_prefix(self, ip: str, prefix_length: int):
+        self.__ip = IPv4Address(literal_to_int(ip))
+        self.__mask = prefix_length
+
+        self.__flow(verified_ip=True)
+        return self
+
+    def init_from_int(self, ip: int, prefix_length: int):
+        self.__ip = IPv4Address(ip)
+        self.__mask = prefix_length
+
+        self.__flow(verified_ip=True)
+        return self
+
     #
     # init flow
     #
-    def __flow(self):
+    def __flow(self, verified_ip=False):
         # Flow function is created to simplify code.
         # All the inits use the same flow, so I found useful to put all of that in one function
 
-        self.__verify_provided_types()
+        cache = IPv4Network.__cache
+        key = self.__cache_key() if cache is not None else None
+        if key is not None:
+            state = cache.get(key)
+            if state is not None:
+                self.__restore_state(key, state)
+                return
+
+        if not verified_ip:
+            self.__verify_provided_types()
         self.__calculate_mask()
         self.__verify_rfc_rules()
 
@@ -130,91 +200,122 @@ class IPv4Network:
 
         self.__activated = True
 
+        if key is not None:
+            cache.put(key, (self.__rfc_current_range, self.__network_bounds, self.__address_type))
+
+    def __cache_key(self) -> Union[Tuple[int, int], None]:
+        """
+        Normalizes the provided ip and mask into an (ip, mask length) couple, None if they cannot be normalized
+        without a full validation
+        """
+
+        if len(self.__ip) != 4:
+            return None
+
+        length = self.__lookup_mask_length(self.__mask)
+        return (int(self.__ip), length) if length is not None else None
+
+    def __restore_state(self, key: Tuple[int, int], state: tuple) -> None:
+        ip, length = key
+
+        self.__ip = IPv4Address(ip)
+        self.__mask_length = length
+        self.__mask = IPv4Address(Utils.masks_by_length[length])
+        self.__addresses = 2 ** (32 - length) - 2
+        self.__rfc_current_range, self.__network_bounds, self.__address_type = state
+        self.__network_range = None
+
+        self.__activated = True
+
     def __verify_provided_types(self) -> None:
         """
-        Verifies the provided types (ip, and mask). If a CIDR was passed, the __init__ took care of the spliting into
-        respective ip and mask.
+        Verifies the provided IP. Its bytes were already checked when the FourBytesLiteral was set,
+        so only its length is left to check.
 
         :raises:
             IPBytesLengthException: If the IP block is not 4 bytes long.
-            IPByteNumberOffLimitsException: If a byte from the IP is not between 0 and 255
-            MaskBytesLengthException! If the mask is not 4 bytes long.
-            MaskByteNumberOffLimitsException: If a byte from the mask is not between 0 and 255
-            MaskLengthOffBoundsException: If the mask length is not between 0 and 32
         """
 
         temp = self.__ip
         if len(temp) != 4:
             raise BytesLengthException('IP', len(temp))
-        for e in temp:
-            if not (0 <= int(e) <= 255):
-                raise ByteNumberOffLimitsException('IP', e, temp.index(e))
-
-        try:
-            temp = self.__mask.split('.')
-            if len(temp) == 1:
-                raise AttributeError()
-            if len(temp) != 4:
-                raise BytesLengthException('mask', len(temp))
-            for e in temp:
-                if not (0 <= int(e) <= 255):
-                    raise ByteNumberOffLimitsException('Mask', e, temp.index(e))
-        except (AttributeError, ValueError):
-            if 0 <= int(self.__mask) <= 32:
-                return
-            else:
-                raise MaskLengthOffBoundsException(self.__mask)
+        self.__ip = IPv4Address(int(temp))
 
     def __calculate_mask(self) -> None:
         """
         Calculates the mask from the instance var self.__mask
 
-        If the mask is a literal mask (i.e. '255.255.255.0'), the try case is concerned.
-        If instead, the user gave the mask length, we make sure to raise an AttributeError to switch to the
-        except case to do proper testing.
+        Every valid mask (length, literal or integer) is found in the Utils lookup tables. The mask is only parsed
+        byte per byte when it is not, to raise the right exception.
+        """
+
+        mask = self.__mask
+
+        length = self.__lookup_mask_length(mask)
+        if length is None:
+            length = self.__diagnose_mask(str(mask) if isinstance(mask, (FourBytesLiteral, IPv4Address)) else mask)
+
+        self.__mask_length = length
+        self.__mask = IPv4Address(Utils.masks_by_length[length])
+        self.__addresses = 2 ** (32 - length) - 2
+
+    @staticmethod
+    def __lookup_mask_length(mask: Union[str, int, FourBytesLiteral, IPv4Address]) -> Union[int, None]:
+        """
+        Finds the length of a valid mask in the Utils lookup tables, None if the mask is not valid
+        """
+
+        if isinstance(mask, (FourBytesLiteral, IPv4Address)):
+            return Utils.mask_lengths_by_int.get(int(mask)) if len(mask) == 4 else None
+        elif isinstance(mask, int):
+            return mask if 0 <= mask <= 32 else None
+        return Utils.mask_lengths_by_literal.get(mask)
+
+    @staticmethod
+    def __diagnose_mask(mask: Union[str, int]) -> int:
+        """
+        Parses a mask that was not found in the lookup tables
 
         :raises:
+            MaskBytesLengthException! If the mask is not 4 bytes long.
+            MaskByteNumberOffLimitsException: If a byte from the mask is not between 0 and 255
+            MaskLengthOffBoundsException: If the mask length is not between 0 and 32
             IncorrectMaskException: if the mask is wrongly formed (byte != 0 after byte < 255) or if the mask contains a
                 byte that cannot be used in a mask.
         """
 
-        try:
-            # The mask is given by its literal
-            temp = self.__mask.split('.')
-            if len(temp) == 1:
-                # If the mask is given by its length
-                # Use AttributeError raise to switch to the except case
-                raise AttributeError()
-
-            length = 0
-
-            for byte in range(4):
-                concerned = int(temp[byte])
-                # We check that the byte is in the awaited bytes list
-                if concerned in Utils.mask_allowed_bytes:
-                    # If mask contains a 0, we check that each next byte
-                    # contains only a 0, else we raise an IncorrectMaskException
-                    if concerned < 255:
-                        for i in range(1, 4 - byte):
-                            b = temp[byte + i]
-                            if b != '0':
-                                raise IncorrectMaskException(is_out_allowed=False, value=b, extra=byte + i)
-
-                    length += Utils.switch_length(concerned, index=True)
-                else:
-                    raise IncorrectMaskException(is_out_allowed=True, value=concerned)
-
-            # Stock the length
-            self.__mask_length = length
-            self.__mask = FourBytesLiteral().set_from_string_literal(".".join(temp))
-
-        except AttributeError:
+        temp = mask.split('.') if isinstance(mask, str) else [mask]
+        if len(temp) == 1:
             # The mask is given by its length
-            self.__mask_length = int(self.__mask)
-            self.__mask = FourBytesLiteral().set_from_string_literal(Utils.mask_length_to_literal(self.__mask_length))
+            if 0 <= int(mask) <= 32:
+                return int(mask)
+            raise MaskLengthOffBoundsException(mask)
 
-        finally:
-            self.__addresses = 2 ** (32 - self.__mask_length) - 2
+        if len(temp) != 4:
+            raise BytesLengthException('mask', len(temp))
+        for e in temp:
+            if not (0 <= int(e) <= 255):
+                raise ByteNumberOffLimitsException('Mask', e, temp.index(e))
+
+        length = 0
+
+        for byte in range(4):
+            concerned = int(temp[byte])
+            # We check that the byte is in the awaited bytes list
+            if concerned in Utils.mask_allowed_bytes:
+                # If mask contains a 0, we check that each next byte
+                # contains only a 0, else we raise an IncorrectMaskException
+                if concerned < 255:
+                    for i in range(1, 4 - byte):
+                        b = temp[byte + i]
+                        if b != '0':
+                            raise IncorrectMaskException(is_out_allowed=False, value=b, extra=byte + i)
+
+                length += Utils.switch_length(concerned, index=True)
+            else:
+                raise IncorrectMaskException(is_out_allowed=True, value=concerned)
+
+        return length
 
     def __verify_rfc_rules(self) -> None:
         """
@@ -230,29 +331,191 @@ class IPv4Network:
             RFCRulesWrongCoupleException: If the mask length is lesser than the one stated above
         """
 
-        def _check(content):
-            ip_test = False
-            for i_ in range(3):
-                if (int(content[0]) == Utils.rfc_allowed_ranges[i_][0]) and \
-                        (Utils.rfc_allowed_ranges[i_][1][0] <= int(content[1]) <= Utils.rfc_allowed_ranges[i_][1][1]):
-                    ip_test = True
-                    self.__rfc_current_range = i_
-
-            if ip_test is False:
-                raise RFCRulesIPWrongRangeException(ip[0], ip[1])
-
-        ip = self.__ip
-        mask = self.__mask_length
+        ip = int(self.__ip)
+        first, second = ip >> 24, (ip >> 16) & 255
 
         # We check that ip respects RFC standards
-        _check(ip)
+        for i in range(3):
+            allowed, (low, high) = Utils.rfc_allowed_ranges[i]
+            if first == allowed and low <= second <= high:
+                self.__rfc_current_range = i
+                break
+        else:
+            raise RFCRulesIPWrongRangeException(first, second)
 
         # We then check that provided mask corresponds to RFC standards
-        for i in range(3):
-            allowed = Utils.rfc_allowed_ranges[i][0]
-            allowed_mask = Utils.rfc_masks[i]
-            if (int(ip[0]) == allowed) and (mask < allowed_mask):
-                raise RFCRulesWrongCoupleException(ip[0], ip[1], allowed_mask, mask)
+        allowed_mask = Utils.rfc_masks[self.__rfc_current_range]
+        if self.__mask_length < allowed_mask:
+            raise RFCRulesWrongCoupleException(first, second, allowed_mask, self.__mask_length)
+
+    #
+    # Batch classification
+    #
+    def classify(self, ips) -> 'np.ndarray':
+        """
+        Classifies a batch of addresses against the network
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: uint8 array of the TYPE_* codes (network, computer, broadcast or outside)
+        """
+
+        values = Utils.to_uint32_array(ips)
+        if not self.__activated:
+            return None
+
+        return Utils.classify_in_bounds(values, *self.__network_bounds)
+
+    #
+    # Addresses walking
+    #
+    def iter_addresses(self, offset: int = 0, stride: int = 1) -> Iterator[IPv4Address]:
+        """
+        Lazily walks the addresses of the network, network and broadcast addresses included
+
+        :param offset: index of the first address to yield
+        :param stride: step between two yielded addresses
+        """
+
+        for value in self.__walk_range(False, offset, stride):
+            yield IPv4Address(value)
+
+    def hosts(self, offset: int = 0, stride: int = 1) -> Iterator[IPv4Address]:
+        """
+        Lazily walks the computer addresses of the network (neither the network nor the broadcast address)
+
+        :param offset: index of the first host to yield
+        :param stride: step between two yielded hosts
+        """
+
+        for value in self.__walk_range(True, offset, stride):
+            yield IPv4Address(value)
+
+    def address_chunks(self, chunk_size: int, offset: int = 0, stride: int = 1,
+                       hosts_only: bool = False) -> Iterator['np.ndarray']:
+        """
+        Walks the addresses of the network by uint32 blocks of at most chunk_size addresses,
+        so that whole networks can be streamed in constant memory
+
+        :param chunk_size: maximum number of addresses per block
+        :param offset: index of the first address to yield
+        :param stride: step between two yielded addresses
+        :param hosts_only: only yield the computer addresses
+        """
+
+        import numpy as np
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be strictly positive")
+
+        walk = self.__walk_range(hosts_only, offset, stride)
+        for i in range(0, len(walk), chunk_size):
+            block = walk[i:i + chunk_size]
+            yield np.arange(block.start, block.stop, block.step, dtype=np.int64).astype(np.uint32)
+
+    def address_at(self, index: int) -> IPv4Address:
+        """
+        Random access to the addresses of the network. Negative indexes start from the broadcast address
+
+        :raises:
+            IndexError: If the index is out of the network range
+        """
+
+        if not self.__activated:
+            return None
+
+        return IPv4Address(range(self.__network_bounds[0], self.__network_bounds[1] + 1)[index])
+
+    def __walk_range(self, hosts_only: bool, offset: int, stride: int) -> range:
+        if offset < 0 or stride < 1:
+            raise ValueError("Offset must be positive and stride strictly positive")
+        if not self.__activated:
+            return range(0)
+
+        start, end = self.__network_bounds
+        if hosts_only:
+            start, end = start + 1, end - 1
+
+        return range(start + offset, end + 1, stride)
+
+    #
+    # Subnets and supernet
+    #
+    def iter_subnets(self, new_prefix: int = None, prefixlen_diff: int = None) -> Iterator['IPv4Network']:
+        """
+        Lazily walks the subnets of the network
+
+        :param new_prefix: mask length of the subnets
+        :param prefixlen_diff: difference between the mask length of the subnets and the one of the network,
+            used when new_prefix is not given. Defaults to 1
+        """
+
+        walk = self.__walk_subnets(new_prefix, prefixlen_diff)
+        length = 32 - (walk.step.bit_length() - 1)
+
+        for network in walk:
+            yield IPv4Network().init_from_int(network, length)
+
+    def subnet_at(self, index: int, new_prefix: int = None, prefixlen_diff: int = None) -> 'IPv4Network':
+        """
+        Random access to the subnets of the network. Negative indexes start from the last subnet
+
+        :raises:
+            IndexError: If there are not enough subnets
+        """
+
+        walk = self.__walk_subnets(new_prefix, prefixlen_diff)
+        return IPv4Network().init_from_int(walk[index], 32 - (walk.step.bit_length() - 1))
+
+    def subnets_count(self, new_prefix: int = None, prefixlen_diff: int = None) -> int:
+        return len(self.__walk_subnets(new_prefix, prefixlen_diff))
+
+    def subnet_chunks(self, chunk_size: int, new_prefix: int = None,
+                      prefixlen_diff: int = None) -> Iterator['np.ndarray']:
+        """
+        Walks the network addresses of the subnets by uint32 blocks of at most chunk_size subnets
+        """
+
+        import numpy as np
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be strictly positive")
+
+        walk = self.__walk_subnets(new_prefix, prefixlen_diff)
+        for i in range(0, len(walk), chunk_size):
+            block = walk[i:i + chunk_size]
+            yield np.arange(block.start, block.stop, block.step, dtype=np.int64).astype(np.uint32)
+
+    def supernet(self, new_prefix: int = None, prefixlen_diff: int = 1) -> 'IPv4Network':
+        """
+        Network containing this one, with a shorter mask
+
+        :param new_prefix: mask length of the supernet
+        :param prefixlen_diff: difference between the mask length of the network and the one of the supernet,
+            used when new_prefix is not given
+        """
+
+        if not self.__activated:
+            return None
+        if new_prefix is None:
+            new_prefix = self.__mask_length - prefixlen_diff
+        if not (0 <= new_prefix <= self.__mask_length):
+            raise ValueError(f"Supernet mask length must be between 0 and {self.__mask_length}, found {new_prefix}")
+
+        return IPv4Network().init_from_int(self.__network_bounds[0] & Utils.masks_by_length[new_prefix], new_prefix)
+
+    def __walk_subnets(self, new_prefix: Union[int, None], prefixlen_diff: Union[int, None]) -> range:
+        if new_prefix is not None and prefixlen_diff is not None:
+            raise ValueError("Only one of new_prefix and prefixlen_diff can be given")
+        if not self.__activated:
+            return range(0)
+
+        if new_prefix is None:
+            new_prefix = self.__mask_length + (1 if prefixlen_diff is None else prefixlen_diff)
+        if not (self.__mask_length <= new_prefix <= 32):
+            raise ValueError(f"Subnets mask length must be between {self.__mask_length} and 32, found {new_prefix}")
+
+        start, end = self.__network_bounds
+        return range(start, end + 1, 1 << (32 - new_prefix))
 
     #
     # Template for child classes
@@ -279,25 +542,19 @@ class IPv4Network:
     #
     # Main functions
     #
-    def __determine_network_range(self) -> Dict[str, FourBytesLiteral]:
-
-        ip = self.__ip
-        mask = self.__mask
+    def __determine_network_range(self) -> Tuple[int, int]:
 
-        # Network address
-        net = FourBytesLiteral()
-        for i in range(4):
-            net.append(ip[i] & mask[i])
+        mask = int(self.__mask)
 
-        # Broadcast address
-        bct = FourBytesLiteral()
-        for i in range(4):
-            bct.append(ip[i] | (255 ^ mask[i]))
+        # Network and broadcast addresses
+        net = int(self.__ip) & mask
+        bct = net | (mask ^ IPV4_MAX)
 
-        result = {"start": net, "end": bct}
-        self.__network_range = result
+        # The FourBytesLiteral range is only built when accessed
+        self.__network_bounds = (net, bct)
+        self.__network_range = None
 
-        return result
+        return self.__network_bounds
 
     def __determine_type(self) -> int:
         """
@@ -309,11 +566,12 @@ class IPv4Network:
             IPOffNetworkRangeException: If the given IP is not in the network range
         """
 
-        res = self.displayable_network_range
+        start, end = self.__network_bounds
+        ip = int(self.__ip)
 
-        if res['start'] == str(self.__ip):
+        if ip == start:
             self.__address_type = 0
-        elif res['end'] == str(self.__ip):
+        elif ip == end:
             self.__address_type = 2
         else:
             self.__address_type = 1
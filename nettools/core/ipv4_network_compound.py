@@ -1,8 +1,39 @@
+from nettools.core.buddy_allocator import BuddyAllocator
 from nettools.core.ipv4_network import IPv4Network
-from nettools.utils.errors import MaskTooSmallException
+from nettools.utils.errors import MaskTooSmallException, NoFreeBlockException
 from nettools.utils.utils import Utils
-from nettools.utils.ip_class import FourBytesLiteral
-from typing import Union, List
+from nettools.utils.ip_class import FourBytesLiteral, literal_to_int
+from nettools.core import renderers
+from typing import Union, List, NamedTuple, TextIO, Tuple, TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class CompoundStats(NamedTuple):
+    """
+    Utilization of a compound. Addresses, allocated, free and the largest free block count every address of the
+    blocks, requested counts the computer addresses asked for. Occupancy is the allocated share of the network
+    """
+
+    subnets: int
+    addresses: int
+    allocated: int
+    requested: int
+    free: int
+    largest_free_block: int
+    fragmentation: float
+    occupancy: float
+
+
+class SubnetUsage(NamedTuple):
+    """
+    Computer addresses requested for a subnet and available in it
+    """
+
+    requested: int
+    allocated: int
 
 
 class IPv4NetworkCompound(IPv4Network):
@@ -13,6 +44,21 @@ class IPv4NetworkCompound(IPv4Network):
     __subnets_sizes: List[int] = None
     __subnets: List[IPv4Network] = None
     __submasks_machine_bits: List[int] = None
+    __allocator: BuddyAllocator = None
+
+    # Subnets bounds, kept sorted by address like the subnets themselves
+    __starts: List[int] = None
+    __ends: List[int] = None
+    __bounds_arrays: Tuple['np.ndarray', 'np.ndarray'] = None
+
+    # Running counters, updated on each addition and removal
+    __allocated_total: int = 0
+    __requested_total: int = 0
+
+    # Nesting: counters of the whole subtree, rolled up to the parents on each change
+    __parent: 'IPv4NetworkCompound' = None
+    __leaf_count: int = 0
+    __tree_requested: int = 0
 
     #
     # Properties
@@ -25,6 +71,63 @@ class IPv4NetworkCompound(IPv4Network):
     def subnets(self):
         return self.__subnets if self.__activated else None
 
+    @property
+    def fragmentation(self):
+        """
+        Fragmentation of the free space of the network (see BuddyAllocator.fragmentation)
+        """
+
+        return self.__allocator.fragmentation if self.__activated else None
+
+    @property
+    def stats(self) -> Union[CompoundStats, None]:
+        """
+        Utilization of the compound, computed in constant time from running counters
+        """
+
+        if not self.__activated:
+            return None
+
+        allocator = self.__allocator
+        return CompoundStats(len(self.__subnets), allocator.total_addresses, self.__allocated_total,
+                             self.__requested_total, allocator.free_addresses, allocator.largest_free_block,
+                             allocator.fragmentation, self.__allocated_total / allocator.total_addresses)
+
+    @property
+    def subnets_usage(self) -> Union[List[SubnetUsage], None]:
+        if not self.__activated:
+            return None
+        return list(self.iter_usage())
+
+    def iter_usage(self):
+        if not self.__activated:
+            return
+        for size, bits in zip(self.__subnets_sizes, self.__submasks_machine_bits):
+            yield SubnetUsage(size, 2 ** bits - 2)
+
+    @property
+    def parent(self) -> Union['IPv4NetworkCompound', None]:
+        return self.__parent
+
+    @property
+    def leaf_count(self) -> int:
+        """
+        Number of subnets of the tree that are not subdivided
+        """
+
+        return self.__leaf_count
+
+    @property
+    def tree_requested(self) -> int:
+        """
+        Computer addresses requested by the leaves of the tree
+        """
+
+        return self.__tree_requested
+
+    def subnet_usage(self, index: int) -> SubnetUsage:
+        return SubnetUsage(self.__subnets_sizes[index], 2 ** self.__submasks_machine_bits[index] - 2)
+
     #
     # Init
     #
@@ -43,92 +146,310 @@ class IPv4NetworkCompound(IPv4Network):
     #
     # Fill compound
     #
-    def add_from_addresses(self, sizes: Union[List, int]):
+    def add_from_addresses(self, sizes: Union[List, int], stable: bool = False):
+        """
+        Adds subnets able to hold the given numbers of computer addresses
+
+        :param sizes: one size or a list of sizes
+        :param stable: if True, already assigned subnets are kept where they are and the new ones are placed in the
+            free space left, instead of sorting and rebuilding every subnet
+        :raises:
+            MaskTooSmallException: If the subnets do not fit in the network
+            NoFreeBlockException: If the subnets fit but the free space is too fragmented to place them stably
+        """
+
         if isinstance(sizes, int):
             sizes = [sizes]
 
-        if not self.__subnets_sizes:
-            self.__subnets_sizes = sorted(sizes, reverse=True)
-        else:
-            li = self.__subnets_sizes
-            li.extend(sizes)
-            self.__subnets_sizes = sorted(li, reverse=True)
+        if stable and self.__activated:
+            self.__place_subnets(sorted(sizes, reverse=True))
+            return self
 
-        self.__subnet_flow()
+        if self.__activated and any(isinstance(n, IPv4NetworkCompound) for n in self.__subnets):
+            raise ValueError("Subdivided subnets cannot be moved, add the new subnets with stable=True")
+
+        self.__subnet_flow(sorted((self.__subnets_sizes or []) + list(sizes), reverse=True))
         return self
 
     def remove_subnet(self, index: int):
+        """
+        Removes a subnet and gives its addresses back to the free space of the network
+        """
+
+        self.__allocator.free(self.__starts[index])
+        self.__allocated_total -= 2 ** self.__submasks_machine_bits[index]
+        self.__requested_total -= self.__subnets_sizes[index]
+
+        removed = self.__subnets[index]
+        if isinstance(removed, IPv4NetworkCompound):
+            removed.__parent = None
+            self.__roll_up(-removed.__leaf_count, -removed.__tree_requested)
+        else:
+            self.__roll_up(-1, -self.__subnets_sizes[index])
+
         del self.__subnets[index]
         del self.__submasks_machine_bits[index]
         del self.__subnets_sizes[index]
+        del self.__starts[index]
+        del self.__ends[index]
+        self.__bounds_arrays = None
+
+    def subdivide(self, index: int, sizes: Union[List, int]) -> 'IPv4NetworkCompound':
+        """
+        Replaces a subnet by a compound of the same network, split in subnets of the given sizes. The counters of
+        the tree are updated up to the root
+
+        :return: the new child compound
+        :raises:
+            MaskTooSmallException: If the sizes do not fit in the subnet
+        """
+
+        subnet = self.__subnets[index]
+        if isinstance(subnet, IPv4NetworkCompound):
+            raise ValueError("Subnet is already subdivided")
+
+        child = IPv4NetworkCompound()
+        child.init_from_int(self.__starts[index], subnet.mask_length)
+        child.add_from_addresses(sizes)
+
+        child.__parent = self
+        self.__subnets[index] = child
+        self.__roll_up(child.__leaf_count - 1, child.__tree_requested - self.__subnets_sizes[index])
+        return child
+
+    def iter_leaves(self):
+        """
+        Yields the subnets of the tree that are not subdivided, sorted by address
+        """
+
+        if not self.__activated:
+            return
+
+        for subnet in self.__subnets:
+            if isinstance(subnet, IPv4NetworkCompound):
+                yield from subnet.iter_leaves()
+            else:
+                yield subnet
 
     #
-    # Flow
+    # Lookups
     #
-    def __subnet_flow(self):
-        self.__subnets = []
-        self.__submasks_machine_bits = []
+    def resolve(self, ip: Union[int, str]) -> Union[IPv4Network, None]:
+        """
+        Leaf subnet of the tree containing an address, found by bisecting each level down from this compound
 
-        # first, let's check if the provided mask can handle all the addresses requested
-        self.__total_network_range = self.displayable_network_range
-        self.__determine_required_submasks_sizes()
+        :return: the leaf subnet, None if the address is outside of every leaf
+        """
 
-        total = 0
+        value = literal_to_int(ip) if isinstance(ip, str) else int(ip)
+        current = self
 
-        for i in range(len(self.__submasks_machine_bits)):
-            total += 2 ** self.__submasks_machine_bits[i]
+        while True:
+            index = current.subnet_index(value)
+            if index == -1:
+                return None
 
-        if self.addresses < total:
-            power = 1
-            while total > 2 ** power:
-                power += 1
-            raise MaskTooSmallException(self.mask_length, 32 - power)
+            subnet = current.__subnets[index]
+            if not isinstance(subnet, IPv4NetworkCompound):
+                return subnet
+            current = subnet
 
-        self.__build_subnets()
+    def subnet_for(self, ip: Union[int, str]) -> Union[IPv4Network, None]:
+        """
+        Subnet containing an address, found by bisection
 
-        self.__activated = True
+        :return: the subnet, None if the address is outside of every subnet
+        """
+
+        index = self.subnet_index(ip)
+        return self.__subnets[index] if index != -1 else None
+
+    def subnet_index(self, ip: Union[int, str]) -> int:
+        """
+        Index of the subnet containing an address, -1 if none
+        """
+
+        if not self.__activated:
+            return -1
+
+        value = literal_to_int(ip) if isinstance(ip, str) else int(ip)
+        index = bisect_right(self.__starts, value) - 1
+        return index if index >= 0 and value <= self.__ends[index] else -1
+
+    def subnet_indexes(self, ips) -> 'np.ndarray':
+        """
+        Index of the subnet containing each address of a batch
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: int64 array of the subnet indexes, -1 where the address is outside of every subnet
+        """
+
+        return self.__locate(Utils.to_uint32_array(ips))
+
+    def ips_in_subnets(self, ips) -> 'np.ndarray':
+        """
+        checks which ips of a batch are in one of the subnets of the compound
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: boolean mask, True where the ip is in a subnet
+        """
+
+        return self.__locate(Utils.to_uint32_array(ips)) != -1
+
+    def classify_in_subnets(self, ips) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Classifies a batch of addresses against the subnets of the compound
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return: a uint8 array of the TYPE_* codes relative to the containing subnet, and an int64 array of the
+            containing subnet indexes (-1 when the address is outside of every subnet)
+        """
 
-    def __determine_required_submasks_sizes(self) -> None:
+        import numpy as np
 
-        submasks = []
+        values = Utils.to_uint32_array(ips)
+        index = self.__locate(values)
+        if not self.__activated or not self.__subnets:
+            return np.full(len(values), self.TYPE_OUTSIDE, dtype=np.uint8), index
 
-        for i in range(len(self.__subnets_sizes)):
-            power = 1
-            while 2 ** power - 2 < self.__subnets_sizes[i]:
-                power += 1
-            submasks.append(power)
+        starts, ends = self.__subnets_bounds()
+        found = index != -1
+        safe = np.maximum(index, 0)
 
-        self.__submasks_machine_bits = submasks
+        types = Utils.classify_in_bounds(values, starts[safe], ends[safe])
+        types[~found] = self.TYPE_OUTSIDE
+        return types, index
 
-    def __build_subnets(self) -> None:
-        start_ip = self.network_range['start']
+    def __subnets_bounds(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        if self.__bounds_arrays is None:
+            import numpy as np
+            self.__bounds_arrays = (np.array(self.__starts, dtype=np.uint32), np.array(self.__ends, dtype=np.uint32))
+        return self.__bounds_arrays
 
-        for i in range(len(self.__subnets_sizes)):
-            machines_bits = self.__submasks_machine_bits[i]
-            mask_literal = FourBytesLiteral().set_eval(Utils.mask_length_to_literal(32 - machines_bits))
+    def __locate(self, values: 'np.ndarray') -> 'np.ndarray':
+        """
+        Index of the subnet containing each value, -1 if none
+        """
 
-            result = IPv4Network().init_from_fbl(start_ip, mask_literal)
-            self.__subnets.append(result)
-            start_ip = Utils.ip_after(result.network_range['end'])
+        import numpy as np
+
+        result = np.full(len(values), -1, dtype=np.int64)
+        if not self.__activated or not self.__subnets:
+            return result
+
+        starts, ends = self.__subnets_bounds()
+
+        position = np.searchsorted(starts, values, side='right') - 1
+        safe = np.maximum(position, 0)
+        found = (position >= 0) & (values <= ends[safe])
+
+        result[found] = position[found]
+        return result
+
+    #
+    # Flow
+    #
+    def __subnet_flow(self, sizes: List[int]) -> None:
+        """
+        Rebuilds every subnet from the given sizes, sorted in descending order. The capacity is checked before
+        anything is changed, so a failed rebuild leaves the compound as it was
+        """
+
+        machine_bits = [Utils.required_machine_bits(size) for size in sizes]
+        total = sum(2 ** bits for bits in machine_bits)
+        self.__check_capacity(total)
+
+        allocator, subnets, starts, ends = self.__build_subnets(machine_bits)
+
+        self.__total_network_range = self.displayable_network_range
+        self.__subnets_sizes = sizes
+        self.__submasks_machine_bits = machine_bits
+        self.__allocator = allocator
+        self.__subnets = subnets
+        self.__starts = starts
+        self.__ends = ends
+        self.__bounds_arrays = None
+
+        self.__allocated_total = total
+        self.__requested_total = sum(sizes)
+        self.__roll_up(len(subnets) - self.__leaf_count, self.__requested_total - self.__tree_requested)
+
+        self.__activated = True
+
+    def __check_capacity(self, total: int) -> None:
+        """
+        Checks that subnets whose blocks add up to `total` addresses fit in the network, whatever the insertion mode
+
+        :raises:
+            MaskTooSmallException: If the subnets exceed the network
+        """
+
+        if not Utils.blocks_fit(total, self.mask_length):
+            raise MaskTooSmallException(self.mask_length, Utils.required_mask_length(total))
+
+    def __build_subnets(self, machine_bits: List[int]) -> Tuple[BuddyAllocator, List[IPv4Network], List[int],
+                                                                 List[int]]:
+        # Sizes are sorted in descending order, so the buddy allocator packs the subnets one after the other
+        allocator = BuddyAllocator(self.network_bounds[0], self.mask_length)
+        subnets, starts, ends = [], [], []
+
+        for machines_bits in machine_bits:
+            start = allocator.allocate_prefix(32 - machines_bits)
+            subnets.append(IPv4Network().init_from_int(start, 32 - machines_bits))
+            starts.append(start)
+            ends.append(start + 2 ** machines_bits - 1)
+
+        return allocator, subnets, starts, ends
+
+    def __place_subnets(self, sizes: List[int]) -> None:
+        """
+        Allocates new subnets in the free space of the network without moving the assigned ones. Subnets are kept
+        sorted by address. Nothing is changed if one of the subnets does not fit or cannot be placed.
+        """
+
+        # The running counter holds the blocks already assigned, so that adding subnets one at a time stays linear
+        total = self.__allocated_total + sum(2 ** Utils.required_machine_bits(s) for s in sizes)
+        self.__check_capacity(total)
+        placements = []
+
+        for size in sizes:
+            bits = Utils.required_machine_bits(size)
+            try:
+                placements.append((self.__allocator.allocate_prefix(32 - bits), bits, size))
+            except NoFreeBlockException:
+                # A larger mask would not help: the subnets fit, but the free space is split in smaller blocks
+                for start, _, _ in placements:
+                    self.__allocator.free(start)
+                raise
+
+        for start, bits, size in placements:
+            index = bisect_left(self.__starts, start)
+            self.__subnets.insert(index, IPv4Network().init_from_int(start, 32 - bits))
+            self.__submasks_machine_bits.insert(index, bits)
+            self.__subnets_sizes.insert(index, size)
+            self.__starts.insert(index, start)
+            self.__ends.insert(index, start + 2 ** bits - 1)
+
+            self.__allocated_total += 2 ** bits
+            self.__requested_total += size
+            self.__roll_up(1, size)
+
+        self.__bounds_arrays = None
+
+    def __roll_up(self, leaves: int, requested: int) -> None:
+        compound = self
+        while compound is not None:
+            compound.__leaf_count += leaves
+            compound.__tree_requested += requested
+            compound = compound.__parent
 
     #
     # Displays helpers
     #
     def __build_graph(self):
         # graph
-        occupied = 0
-        for i in range(len(self.__submasks_machine_bits)):
-            occupied += 2 ** self.__submasks_machine_bits[i] - 2
-        percentage = round((occupied / self.addresses) * 100)
-        graph = '['
-        current = 0
-        for i in range(20):
-            if current < percentage:
-                graph += '█'
-            else:
-                graph += '░'
-            current += 5
-        graph += "] {} %".format(percentage)
+        occupied = self.__allocated_total - 2 * len(self.__subnets)
+        graph = renderers.usage_graph(round((occupied / self.addresses) * 100))
 
         if len(self.__subnets) > 1:
             t = 's'
@@ -196,3 +517,13 @@ class IPv4NetworkCompound(IPv4Network):
         if not self.__activated:
             return
         self.__display_subnets(advanced)
+
+    def write_subnetworks(self, stream: TextIO, fmt: str = 'text', advanced: bool = False) -> int:
+        """
+        Streams the compound to a file-like object as text (like print_subnetworks_fancy), json, ndjson or csv,
+        through a single buffered writer (see renderers.render)
+
+        :return: the number of characters written
+        """
+
+        return renderers.render(self, stream, fmt, advanced)
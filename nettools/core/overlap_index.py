@@ -0,0 +1,138 @@
+from nettools.core.aggregation import NetworkLike
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.utils.utils import Utils
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+
+class Conflicts(NamedTuple):
+    """
+    Entries of the index conflicting with one network, as entry ids
+    """
+
+    duplicates: List[int]
+    containers: List[int]
+    contained: List[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.duplicates or self.containers or self.contained)
+
+
+class OverlapReport(NamedTuple):
+    """
+    Every conflict of the index, as couples of entry ids. Containments are (container, contained) couples,
+    overlaps hold both the duplicates and the containments
+    """
+
+    duplicates: List[Tuple[int, int]]
+    containments: List[Tuple[int, int]]
+    overlaps: List[Tuple[int, int]]
+
+
+class OverlapIndex:
+    """
+    Index of networks detecting duplicates and containments.
+
+    Two prefixes either are disjoint or one contains the other, so every overlap is a duplicate or a containment.
+    The full report is a sort and a sweep over the integer bounds, O(n log n + k) for k conflicts. A new network is
+    checked against the index with at most 33 hash probes for its containers and a bisection for its contained
+    networks.
+    """
+
+    __entries: List[FrozenIPv4Network] = None
+    __labels: List[Any] = None
+    __by_prefix: Dict[Tuple[int, int], List[int]] = None
+    __sorted: List[Tuple[int, int, int]] = None
+
+    def __init__(self, networks: Iterable[NetworkLike] = ()) -> None:
+        self.__entries = []
+        self.__labels = []
+        self.__by_prefix = {}
+        self.__sorted = []
+
+        for network in networks:
+            self.insert(network)
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    #
+    # Accesses
+    #
+    def entry(self, entry_id: int) -> Tuple[FrozenIPv4Network, Any]:
+        return self.__entries[entry_id], self.__labels[entry_id]
+
+    def insert(self, network: NetworkLike, label: Any = None) -> Conflicts:
+        """
+        Adds a network to the index
+
+        :param label: any value identifying the entry, e.g. the team that declared it
+        :return: the conflicts of the network with the entries already in the index
+        """
+
+        net = FrozenIPv4Network.coerce(network)
+        conflicts = self.check(net)
+
+        entry_id = len(self.__entries)
+        self.__entries.append(net)
+        self.__labels.append(label)
+        self.__by_prefix.setdefault((net.network_int, net.prefix_length), []).append(entry_id)
+        insort(self.__sorted, (net.network_int, net.prefix_length, entry_id))
+
+        return conflicts
+
+    def check(self, network: NetworkLike) -> Conflicts:
+        """
+        Finds the entries conflicting with a network, without adding it to the index
+        """
+
+        net = FrozenIPv4Network.coerce(network)
+        start, end = net.network_bounds
+        length = net.prefix_length
+
+        duplicates = list(self.__by_prefix.get((start, length), []))
+
+        containers, masks = [], Utils.masks_by_length
+        for shorter in range(length):
+            containers.extend(self.__by_prefix.get((start & masks[shorter], shorter), []))
+
+        # Entries starting in the network with a longer prefix are the contained ones
+        low = bisect_left(self.__sorted, (start, length + 1, -1))
+        high = bisect_right(self.__sorted, (end, 33, 0))
+        contained = [entry_id for _, entry_length, entry_id in self.__sorted[low:high] if entry_length > length]
+
+        return Conflicts(duplicates, containers, contained)
+
+    def report(self) -> OverlapReport:
+        """
+        Every duplicate and containment of the index
+        """
+
+        duplicates, containments, overlaps = [], [], []
+
+        # Containers come before their contained networks: sort by start, then by growing prefix length
+        order = sorted(range(len(self.__entries)),
+                       key=lambda i: (self.__entries[i].network_int, self.__entries[i].prefix_length))
+
+        # Stack of the entries containing the current one, the most specific on top
+        stack: List[int] = []
+        for current in order:
+            start, end = self.__entries[current].network_bounds
+            while stack and self.__entries[stack[-1]].broadcast_int < start:
+                stack.pop()
+
+            current_length = self.__entries[current].prefix_length
+            for previous in stack:
+                couple = (previous, current)
+                if self.__entries[previous].prefix_length == current_length:
+                    duplicates.append(couple)
+                else:
+                    containments.append(couple)
+                overlaps.append(couple)
+
+            stack.append(current)
+
+        return OverlapReport(duplicates, containments, overlaps)
@@ -0,0 +1,134 @@
+from nettools.core.ipv4_network_compound import IPv4NetworkCompound
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple, TYPE_CHECKING
+import os
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def iter_chunks(iterable: Iterable, chunk_size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def ordered_map(function: Callable, tasks: Iterable[Tuple], jobs: int = None, initializer: Callable = None,
+                initargs: Tuple = ()) -> Iterator[Any]:
+    """
+    Runs function(*task) for each task in a process pool and yields the results in the order of the tasks.
+    At most 2 * jobs tasks are in flight, so the tasks can be a lazy stream. With a single job, tasks run in the
+    calling process
+
+    :param function: a module-level function, so that it can be sent to the workers
+    :param initializer: function called with initargs once in each worker (and once inline with a single job)
+    :raises:
+        ValueError: If jobs is less than 1
+    """
+
+    jobs = default_jobs() if jobs is None else jobs
+    if jobs < 1:
+        raise ValueError(f"Expected at least 1 job, found {jobs}")
+
+    if jobs == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for task in tasks:
+            yield function(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, *task))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+#
+# Compounds
+#
+def compounds_parallel(networks: Sequence[Tuple[int, int]], size_lists: Sequence[Sequence[int]], jobs: int = None,
+                       chunk_size: int = 1024) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray', 'np.ndarray']:
+    """
+    Builds the subnets of many compounds on several processes, each compound being a (network int, mask length)
+    couple with its list of sizes. Chunks are sent to and received from the workers as packed integer buffers
+
+    :return: the uint32 subnet addresses and uint8 mask lengths, flat and in the order of the compounds, int64
+        offsets such that the subnets of compound i are at [offsets[i]:offsets[i + 1]], and a boolean array marking
+        the compounds that could not be built (RFC rules, sizes too large), which have no subnets
+    """
+
+    import numpy as np
+
+    if len(networks) != len(size_lists):
+        raise ValueError("Networks and size lists must have the same length")
+
+    def tasks():
+        for first in range(0, len(networks), chunk_size):
+            chunk = networks[first:first + chunk_size]
+            lists = size_lists[first:first + chunk_size]
+            counts = np.array([len(sizes) for sizes in lists], dtype=np.int64)
+            flat = np.fromiter((size for sizes in lists for size in sizes), dtype=np.int64, count=int(counts.sum()))
+
+            yield (np.array([n[0] for n in chunk], dtype=np.uint32).tobytes(),
+                   np.array([n[1] for n in chunk], dtype=np.uint8).tobytes(),
+                   counts.tobytes(), flat.tobytes())
+
+    starts, lengths, counts = [], [], []
+    for packed_starts, packed_lengths, packed_counts in ordered_map(_compounds_chunk, tasks(), jobs):
+        starts.append(np.frombuffer(packed_starts, dtype=np.uint32))
+        lengths.append(np.frombuffer(packed_lengths, dtype=np.uint8))
+        counts.append(np.frombuffer(packed_counts, dtype=np.int64))
+
+    if not counts:
+        return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.uint8), np.zeros(1, dtype=np.int64), \
+            np.empty(0, dtype=bool)
+
+    counts = np.concatenate(counts)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.maximum(counts, 0), out=offsets[1:])
+
+    return np.concatenate(starts), np.concatenate(lengths), offsets, counts < 0
+
+
+def _compounds_chunk(ips: bytes, mask_lengths: bytes, counts: bytes, sizes: bytes) -> Tuple[bytes, bytes, bytes]:
+    import numpy as np
+
+    ips = np.frombuffer(ips, dtype=np.uint32).tolist()
+    mask_lengths = np.frombuffer(mask_lengths, dtype=np.uint8).tolist()
+    counts = np.frombuffer(counts, dtype=np.int64).tolist()
+    sizes = np.frombuffer(sizes, dtype=np.int64).tolist()
+
+    starts, lengths, built = [], [], []
+    position = 0
+
+    for ip, mask_length, count in zip(ips, mask_lengths, counts):
+        compound_sizes = sizes[position:position + count]
+        position += count
+
+        try:
+            compound = IPv4NetworkCompound().init_from_int(ip, mask_length).add_from_addresses(compound_sizes)
+        except Exception:
+            built.append(-1)
+            continue
+
+        for subnet in compound.subnets:
+            starts.append(subnet.network_bounds[0])
+            lengths.append(subnet.mask_length)
+        built.append(len(compound.subnets))
+
+    return (np.array(starts, dtype=np.uint32).tobytes(), np.array(lengths, dtype=np.uint8).tobytes(),
+            np.array(built, dtype=np.int64).tobytes())
@@ -0,0 +1,160 @@
+from nettools.utils.ip_class import int_to_literal
+from nettools.utils.utils import Utils
+from typing import Dict, Iterable, Iterator, TextIO
+import json
+
+
+FORMATS = ('text', 'json', 'ndjson', 'csv')
+CSV_COLUMNS = ('start', 'end', 'mask_length', 'available', 'requested')
+
+
+def usage_graph(percentage: int) -> str:
+    """
+    20 characters bar of the network usage, as displayed by IPv4NetworkCompound.print_subnetworks_fancy
+    """
+
+    filled = min(20, max(0, (percentage + 4) // 5))
+    return '[' + '█' * filled + '░' * (20 - filled) + "] {} %".format(percentage)
+
+
+def iter_records(compound) -> Iterator[Dict]:
+    """
+    Yields one dict per subnet of a compound, without building the whole list
+    """
+
+    for subnet, usage in zip(compound.subnets or (), compound.iter_usage()):
+        start, end = subnet.network_bounds
+        yield {
+            'start': int_to_literal(start),
+            'end': int_to_literal(end),
+            'mask_length': subnet.mask_length,
+            'available': usage.allocated,
+            'requested': usage.requested
+        }
+
+
+def iter_text(compound, advanced: bool = False) -> Iterator[str]:
+    """
+    Yields the lines of print_subnetworks_fancy, newline included
+    """
+
+    if not compound.activated:
+        return
+
+    lang = compound.lang_dict
+    stats = compound.stats
+    netr = compound.displayable_network_range
+    literal_ip = Utils.to_literal(compound.ip)
+    occupied = stats.allocated - 2 * stats.subnets
+
+    yield lang['network'] + '\n'
+    yield lang['cidr_adv' if advanced else 'cidr'].format(literal_ip, compound.mask_length) + '\n'
+    yield "{} - {}\n".format(netr['start'], netr['end'])
+    if advanced:
+        yield lang['addr_avail_advanced'].format(occupied, compound.addresses) + '\n'
+    else:
+        yield lang['addr_avail'].format(compound.addresses) + '\n'
+    yield '\n'
+    yield lang['utils'].format(stats.subnets, 's' if stats.subnets > 1 else '') + '\n'
+
+    for record in iter_records(compound):
+        if advanced:
+            yield lang['sub_addr_advanced'].format(record['start'], record['end'], record['available'],
+                                                   record['requested']) + '\n'
+        else:
+            yield lang['sub_addr'].format(record['start'], record['end'], record['available']) + '\n'
+
+    if advanced:
+        yield '\n'
+        yield lang['net_usage'] + '\n'
+        yield usage_graph(round((occupied / compound.addresses) * 100)) + '\n'
+
+
+def iter_json(compound) -> Iterator[str]:
+    """
+    Yields a single JSON document describing the compound and its subnets, piece by piece. Nothing is yielded for
+    a compound without network
+    """
+
+    if compound.network_bounds is None:
+        return
+
+    start, _ = compound.network_bounds
+    yield '{{"network": "{}/{}", "addresses": {}, "subnets": ['.format(int_to_literal(start), compound.mask_length,
+                                                                      compound.addresses)
+
+    separator = ''
+    for record in iter_records(compound):
+        yield separator + json.dumps(record)
+        separator = ', '
+
+    yield ']}\n'
+
+
+def iter_ndjson(compound) -> Iterator[str]:
+    """
+    Yields one JSON object per subnet and per line
+    """
+
+    for record in iter_records(compound):
+        yield json.dumps(record) + '\n'
+
+
+def iter_csv(compound, header: bool = True) -> Iterator[str]:
+    """
+    Yields a CSV header then one row per subnet. Values never contain separators, so no quoting is needed
+    """
+
+    if header:
+        yield ','.join(CSV_COLUMNS) + '\n'
+
+    for record in iter_records(compound):
+        yield ','.join(str(record[c]) for c in CSV_COLUMNS) + '\n'
+
+
+def write_chunks(chunks: Iterable[str], stream: TextIO, buffer_size: int = 1 << 16) -> int:
+    """
+    Writes strings to a file-like object, grouped in writes of about buffer_size characters
+
+    :return: the number of characters written
+    """
+
+    buffer, buffered, written = [], 0, 0
+
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= buffer_size:
+            stream.write(''.join(buffer))
+            written += buffered
+            buffer, buffered = [], 0
+
+    if buffer:
+        stream.write(''.join(buffer))
+        written += buffered
+
+    return written
+
+
+def render(compound, stream: TextIO, fmt: str = 'text', advanced: bool = False,
+           buffer_size: int = 1 << 16) -> int:
+    """
+    Streams a compound to a file-like object in one of FORMATS
+
+    :return: the number of characters written
+    :raises:
+        ValueError: If the format is unknown
+    """
+
+    if fmt == 'text':
+        chunks = iter_text(compound, advanced)
+    elif fmt == 'json':
+        chunks = iter_json(compound)
+    elif fmt == 'ndjson':
+        chunks = iter_ndjson(compound)
+    elif fmt == 'csv':
+        chunks = iter_csv(compound)
+    else:
+        raise ValueError(f"Unknown format {fmt}, expected one of {', '.join(FORMATS)}")
+
+    return write_chunks(chunks, stream, buffer_size)
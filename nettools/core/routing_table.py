@@ -0,0 +1,213 @@
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.core.ipv4_network import IPv4Network
+from nettools.utils.ip_class import literal_to_int, IPV4_MAX
+from nettools.utils.utils import Utils
+from typing import Any, Dict, Iterator, List, Tuple, Union
+import numpy as np
+
+
+class RoutingTable:
+    """
+    Longest-prefix-match table of networks with attached payloads.
+
+    Routes are bucketed by prefix length. Single lookups probe the hash table of each used length, longest first,
+    so a lookup costs at most 33 dict accesses whatever the number of routes. Batch lookups split the address space
+    in disjoint intervals, each holding the route matching all of its addresses, and resolve a whole NumPy batch
+    with a single searchsorted over the interval starts.
+    """
+
+    __routes: Dict[int, Tuple[FrozenIPv4Network, Any]] = None
+    __buckets: List[Dict[int, int]] = None
+    __lengths: List[int] = None
+    __next_id: int = 0
+
+    # Sorted arrays of each length, rebuilt on demand for the modified lengths, and the disjoint intervals built
+    # from them for batch lookups, rebuilt on demand after each route change
+    __arrays: Dict[int, Tuple[np.ndarray, np.ndarray]] = None
+    __dirty: set = None
+    __intervals: Tuple[np.ndarray, np.ndarray] = None
+
+    def __init__(self) -> None:
+        self.__routes = {}
+        self.__buckets = [{} for _ in range(33)]
+        self.__lengths = []
+        self.__arrays = {}
+        self.__dirty = set()
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__routes)
+
+    def __contains__(self, network: Union[IPv4Network, FrozenIPv4Network, str]) -> bool:
+        net = FrozenIPv4Network.coerce(network)
+        return net.network_int in self.__buckets[net.prefix_length]
+
+    def __iter__(self) -> Iterator[Tuple[FrozenIPv4Network, Any]]:
+        return iter(sorted(self.__routes.values(), key=lambda route: route[0]))
+
+    #
+    # Modifications
+    #
+    def insert(self, network: Union[IPv4Network, FrozenIPv4Network, str], payload: Any = None) -> int:
+        """
+        Inserts a route, replacing the payload if the network is already in the table
+
+        :return: the route id, as returned by the batch lookups
+        """
+
+        net = FrozenIPv4Network.coerce(network)
+        bucket = self.__buckets[net.prefix_length]
+
+        route_id = bucket.get(net.network_int)
+        if route_id is None:
+            route_id = self.__next_id
+            self.__next_id += 1
+            bucket[net.network_int] = route_id
+
+            if len(bucket) == 1:
+                self.__lengths = sorted(self.__lengths + [net.prefix_length], reverse=True)
+            self.__dirty.add(net.prefix_length)
+            self.__intervals = None
+
+        self.__routes[route_id] = (net, payload)
+        return route_id
+
+    def delete(self, network: Union[IPv4Network, FrozenIPv4Network, str]) -> Any:
+        """
+        Removes a route
+
+        :return: the payload of the removed route
+        :raises:
+            KeyError: If the network is not in the table
+        """
+
+        net = FrozenIPv4Network.coerce(network)
+        bucket = self.__buckets[net.prefix_length]
+
+        route_id = bucket.pop(net.network_int)
+        if not bucket:
+            self.__lengths.remove(net.prefix_length)
+        self.__dirty.add(net.prefix_length)
+        self.__intervals = None
+
+        return self.__routes.pop(route_id)[1]
+
+    #
+    # Lookups
+    #
+    def route(self, route_id: int) -> Tuple[FrozenIPv4Network, Any]:
+        return self.__routes[route_id]
+
+    def lookup_route(self, ip: Union[int, str]) -> Union[Tuple[FrozenIPv4Network, Any], None]:
+        """
+        Longest prefix match of a single address
+
+        :return: the (network, payload) couple of the matching route, None if no route matches
+        """
+
+        value = literal_to_int(ip) if isinstance(ip, str) else int(ip)
+        masks, buckets = Utils.masks_by_length, self.__buckets
+
+        for length in self.__lengths:
+            route_id = buckets[length].get(value & masks[length])
+            if route_id is not None:
+                return self.__routes[route_id]
+
+        return None
+
+    def lookup(self, ip: Union[int, str]) -> Any:
+        """
+        Longest prefix match of a single address
+
+        :return: the payload of the matching route, None if no route matches
+        """
+
+        route = self.lookup_route(ip)
+        return route[1] if route is not None else None
+
+    def lookup_batch(self, ips) -> np.ndarray:
+        """
+        Longest prefix match of a batch of addresses
+
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: int64 array of the matching route ids (see RoutingTable.route), -1 where no route matches
+        """
+
+        starts, ids = self.__interval_arrays()
+        return ids[np.searchsorted(starts, Utils.to_uint32_array(ips), side='right') - 1]
+
+    def lookup_payloads(self, ips) -> List[Any]:
+        """
+        Longest prefix match of a batch of addresses
+
+        :return: the list of the matching payloads, None where no route matches
+        """
+
+        routes = self.__routes
+        return [routes[i][1] if i != -1 else None for i in self.lookup_batch(ips).tolist()]
+
+    #
+    # Helpers
+    #
+    def __interval_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted interval starts, the first one being 0, and the route id of each interval (-1 for no route). The
+        matching route only changes where a route starts or right after one ends, so the route of an interval is
+        the match of its start
+        """
+
+        if self.__intervals is None:
+            bounds = [np.zeros(1, dtype=np.int64)]
+            for length in self.__lengths:
+                networks, _ = self.__sorted_arrays(length)
+                networks = networks.astype(np.int64)
+                bounds += [networks, networks + (1 << (32 - length))]
+
+            starts = np.unique(np.concatenate(bounds))
+            starts = starts[starts <= IPV4_MAX].astype(np.uint32)
+            ids = self.__match(starts)
+
+            # Adjacent intervals of the same route are merged
+            keep = np.empty(len(ids), dtype=bool)
+            keep[0] = True
+            np.not_equal(ids[1:], ids[:-1], out=keep[1:])
+            self.__intervals = (starts[keep], ids[keep])
+
+        return self.__intervals
+
+    def __match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Longest prefix match of each value, probing the sorted array of each used length, longest first
+        """
+
+        result = np.full(len(values), -1, dtype=np.int64)
+        pending = np.arange(len(values))
+
+        for length in self.__lengths:
+            if not len(pending):
+                break
+
+            networks, ids = self.__sorted_arrays(length)
+            masked = values[pending] & np.uint32(Utils.masks_by_length[length])
+
+            position = np.minimum(np.searchsorted(networks, masked), len(networks) - 1)
+            found = networks[position] == masked
+
+            result[pending[found]] = ids[position[found]]
+            pending = pending[~found]
+
+        return result
+
+    def __sorted_arrays(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        if length in self.__dirty:
+            bucket = self.__buckets[length]
+            networks = np.fromiter(bucket.keys(), dtype=np.uint32, count=len(bucket))
+            ids = np.fromiter(bucket.values(), dtype=np.int64, count=len(bucket))
+
+            order = np.argsort(networks)
+            self.__arrays[length] = (networks[order], ids[order])
+            self.__dirty.discard(length)
+
+        return self.__arrays[length]
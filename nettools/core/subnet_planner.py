@@ -0,0 +1,166 @@
+from nettools.core.aggregation import NetworkLike, collapse
+from nettools.core.buddy_allocator import BuddyAllocator
+from nettools.core.frozen_ipv4_network import FrozenIPv4Network
+from nettools.utils.errors import NoFreeBlockException
+from nettools.utils.utils import Utils
+from itertools import permutations
+from typing import Iterable, List, NamedTuple, Sequence, Tuple, Union
+import numpy as np
+import time
+
+
+class SubnetPlan(NamedTuple):
+    """
+    Result of plan_subnets. Assignments follow the order of the requested sizes, None for the unplaced requests.
+    Wasted addresses are the computer addresses allocated but not requested, fragmentation is the share of the
+    free addresses of all the pools outside of the largest free block
+    """
+
+    assignments: List[Union[FrozenIPv4Network, None]]
+    unplaced: List[int]
+    wasted: int
+    fragmentation: float
+
+
+class CapacityPlan(NamedTuple):
+    """
+    Result of plan_capacities. Prefix lengths are flat, the ones of list i being
+    prefix_lengths[offsets[i]:offsets[i + 1]]. Parent prefixes are -1 when a list does not fit in the IPv4 range
+    """
+
+    prefix_lengths: np.ndarray
+    offsets: np.ndarray
+    block_sizes: np.ndarray
+    parent_prefixes: np.ndarray
+
+
+def plan_capacities(sizes: Union[np.ndarray, Iterable[Sequence[int]]], offsets: np.ndarray = None) -> CapacityPlan:
+    """
+    Computes, for many lists of subnet sizes at once, the prefix length of each subnet, the total number of
+    addresses of each list and the longest parent prefix holding it, without building any network. A compound
+    of the parent prefix accepts the sizes of its list.
+
+    :param sizes: lists of numbers of computer addresses, or a flat array of them split by offsets
+    :param offsets: int array of len(lists) + 1 positions in the flat sizes array, starting at 0
+    :raises:
+        ValueError: If a size is negative or the offsets do not match the sizes
+    """
+
+    if offsets is None:
+        lists = [np.asarray(s, dtype=np.int64).ravel() for s in sizes]
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in lists], out=offsets[1:])
+        sizes = np.concatenate(lists) if lists else np.empty(0, dtype=np.int64)
+    else:
+        sizes = np.asarray(sizes, dtype=np.int64).ravel()
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if not len(offsets) or offsets[0] != 0 or offsets[-1] != len(sizes) or np.any(np.diff(offsets) < 0):
+            raise ValueError("Offsets must grow from 0 to the number of sizes")
+
+    if np.any(sizes < 0):
+        raise ValueError("Subnet sizes must be positive")
+
+    # Vectorized Utils.required_machine_bits, frexp giving the bit lengths
+    _, bits = np.frexp((sizes + 1).astype(np.float64))
+    bits = np.maximum(bits, 1).astype(np.int64)
+
+    cumulated = np.zeros(len(sizes) + 1, dtype=np.int64)
+    np.cumsum(np.int64(1) << bits, out=cumulated[1:])
+    totals = cumulated[offsets[1:]] - cumulated[offsets[:-1]]
+
+    # Vectorized Utils.required_mask_length: the longest parent for which Utils.blocks_fit holds, which is the
+    # capacity rule of IPv4NetworkCompound
+    _, parent_bits = np.frexp(np.maximum(totals - 1, 0).astype(np.float64))
+    parents = 32 - np.maximum(parent_bits, 1)
+    parents[totals > 1 << 32] = -1
+
+    return CapacityPlan((32 - bits).astype(np.int8), offsets, totals, parents.astype(np.int8))
+
+
+def plan_subnets(pools: Iterable[NetworkLike], sizes: Sequence[int], time_budget: float = 0.1) -> SubnetPlan:
+    """
+    Assigns a subnet of one of the pools to each requested number of computer addresses.
+
+    Requests are placed largest first, each in the pool holding the smallest free block able to take it. Blocks
+    being aligned powers of two, this places every request whenever the pools can hold them all. The remaining
+    time budget is spent trying other pool preference orders, keeping the plan leaving the fewest free blocks,
+    i.e. the least fragmented one.
+
+    :param pools: parent networks, overlapping and adjacent pools are merged first
+    :param sizes: numbers of computer addresses required by each subnet
+    :param time_budget: seconds allowed for the search, 0 to only run the greedy placement
+    :raises:
+        ValueError: If a size is negative
+    """
+
+    if any(size < 0 for size in sizes):
+        raise ValueError("Subnet sizes must be positive")
+
+    networks = collapse(pools)
+    bits = [Utils.required_machine_bits(size) for size in sizes]
+    order = sorted(range(len(sizes)), key=lambda i: -bits[i])
+
+    best = _place(networks, order, bits, None)
+    best_score = _score(best, bits)
+    deadline = time.perf_counter() + time_budget
+
+    if time_budget > 0 and len(networks) > 1:
+        for preference in permutations(range(len(networks))):
+            if time.perf_counter() > deadline:
+                break
+
+            candidate = _place(networks, order, bits, preference)
+            score = _score(candidate, bits)
+            if score < best_score:
+                best, best_score = candidate, score
+
+    allocators, starts = best
+    assignments = [FrozenIPv4Network(start, 32 - bits[i]) if start is not None else None
+                   for i, start in enumerate(starts)]
+    wasted = sum(2 ** bits[i] - 2 - sizes[i] for i, start in enumerate(starts) if start is not None)
+
+    return SubnetPlan(assignments, [i for i, start in enumerate(starts) if start is None], wasted,
+                      _fragmentation(allocators))
+
+
+def _place(networks: List[FrozenIPv4Network], order: List[int], bits: List[int],
+           preference: Union[Tuple[int, ...], None]) -> Tuple[List[BuddyAllocator], List[Union[int, None]]]:
+    """
+    Places the requests in the given order. Without preference, each request goes to the pool with the smallest
+    fitting free block (best fit), otherwise to the first pool of the preference order where it fits (first fit)
+    """
+
+    allocators = [BuddyAllocator(n.network_int, n.prefix_length) for n in networks]
+    starts: List[Union[int, None]] = [None] * len(bits)
+
+    for i in order:
+        prefix_length = 32 - bits[i]
+
+        if preference is None:
+            fits = [(a.fitting_block(prefix_length), p) for p, a in enumerate(allocators)]
+            fits = [fit for fit in fits if fit[0]]
+            chosen = [min(fits)[1]] if fits else []
+        else:
+            chosen = preference
+
+        for p in chosen:
+            try:
+                starts[i] = allocators[p].allocate_prefix(prefix_length)
+                break
+            except NoFreeBlockException:
+                continue
+
+    return allocators, starts
+
+
+def _score(placement: Tuple[List[BuddyAllocator], List[Union[int, None]]], bits: List[int]) -> Tuple[int, int]:
+    allocators, starts = placement
+    unplaced = sum(2 ** bits[i] for i, start in enumerate(starts) if start is None)
+    return unplaced, sum(len(a.free_blocks) for a in allocators)
+
+
+def _fragmentation(allocators: List[BuddyAllocator]) -> float:
+    free = sum(a.free_addresses for a in allocators)
+    if not free:
+        return 0.0
+    return (free - max(a.largest_free_block for a in allocators)) / free
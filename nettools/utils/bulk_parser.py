@@ -0,0 +1,175 @@
+from nettools.utils.utils import Utils
+from array import array
+from typing import Iterator, List, Tuple, Union, NamedTuple, BinaryIO, TextIO
+import mmap
+import numpy as np
+
+
+class ParsedBatch(NamedTuple):
+    """
+    Result of one parsed chunk. The three arrays are aligned; `errors` holds (line number, error code) couples
+    """
+
+    ips: np.ndarray
+    mask_lengths: np.ndarray
+    line_numbers: np.ndarray
+    errors: List[Tuple[int, int]]
+
+
+class BulkParser:
+    """
+    Streaming parser for IPs, couples and CIDRs, one per line.
+
+    Accepted lines are `ip`, `ip/mask` and `ip mask`, the mask being given either by its length or by its literal
+    (the formats of IPv4Network.init_from_couple and init_from_cidr). Blank lines and lines starting with `#`
+    are ignored. Invalid lines never raise: they are reported in the batch errors with one of the ERROR_* codes.
+    """
+
+    ERROR_BYTES_LENGTH = 1
+    ERROR_BYTE_OFF_LIMITS = 2
+    ERROR_NOT_A_NUMBER = 3
+    ERROR_MASK_OFF_BOUNDS = 4
+    ERROR_INCORRECT_MASK = 5
+    ERROR_MASK_NOT_PROVIDED = 6
+    ERROR_TOO_MANY_FIELDS = 7
+
+    # Mask length stored for lines that did not provide any mask
+    NO_MASK = 255
+
+    # Every accepted mask spelling, mapped to its length
+    mask_lookup = {k.encode(): v for k, v in Utils.mask_lengths_by_literal.items()}
+
+    __chunk_size: int = None
+    __require_mask: bool = None
+
+    def __init__(self, chunk_size: int = 1 << 22, require_mask: bool = False) -> None:
+        self.__chunk_size = chunk_size
+        self.__require_mask = require_mask
+
+    #
+    # Sources
+    #
+    def parse(self, source: Union[BinaryIO, TextIO, mmap.mmap]) -> Iterator[ParsedBatch]:
+        """
+        Reads the source by chunks and yields one ParsedBatch per chunk. Line numbers start at 1.
+
+        :param source: any object with a read(size) method returning bytes or str (files, mmap, sockets...)
+        """
+
+        line_number = 1
+        remainder = b''
+
+        while True:
+            chunk = source.read(self.__chunk_size)
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if not chunk:
+                break
+
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+
+            yield self.parse_lines(lines, line_number)
+            line_number += len(lines)
+
+        if remainder:
+            yield self.parse_lines([remainder], line_number)
+
+    def parse_file(self, path: str) -> Iterator[ParsedBatch]:
+        """
+        Memory-maps the file at the given path and parses it
+        """
+
+        with open(path, 'rb') as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                return
+            with mapped:
+                yield from self.parse(mapped)
+
+    def parse_all(self, source: Union[BinaryIO, TextIO, mmap.mmap]) -> ParsedBatch:
+        """
+        Parses the whole source and concatenates the batches
+        """
+
+        batches = list(self.parse(source))
+        if not batches:
+            return self.parse_lines([], 1)
+
+        return ParsedBatch(
+            np.concatenate([b.ips for b in batches]),
+            np.concatenate([b.mask_lengths for b in batches]),
+            np.concatenate([b.line_numbers for b in batches]),
+            [e for b in batches for e in b.errors]
+        )
+
+    #
+    # Parsing
+    #
+    def parse_lines(self, lines: List[bytes], first_line_number: int = 1) -> ParsedBatch:
+        ips, lengths, numbers, errors = array('I'), array('B'), array('Q'), []
+        mask_lookup = self.mask_lookup
+        parse_ip = self.__parse_ip
+
+        for number, line in enumerate(lines, first_line_number):
+            line = line.strip()
+            if not line or line[0] == 35:  # '#'
+                continue
+
+            fields = line.replace(b'/', b' ').split()
+            if len(fields) > 2:
+                errors.append((number, self.ERROR_TOO_MANY_FIELDS))
+                continue
+
+            ip = parse_ip(fields[0])
+            if ip < 0:
+                errors.append((number, -ip))
+                continue
+
+            if len(fields) == 1:
+                if self.__require_mask or b'/' in line:
+                    errors.append((number, self.ERROR_MASK_NOT_PROVIDED))
+                    continue
+                length = self.NO_MASK
+            else:
+                length = mask_lookup.get(fields[1])
+                if length is None:
+                    errors.append((number, self.__diagnose_mask(fields[1])))
+                    continue
+
+            ips.append(ip)
+            lengths.append(length)
+            numbers.append(number)
+
+        return ParsedBatch(
+            np.frombuffer(ips, dtype=np.uint32) if ips else np.empty(0, dtype=np.uint32),
+            np.frombuffer(lengths, dtype=np.uint8) if lengths else np.empty(0, dtype=np.uint8),
+            np.frombuffer(numbers, dtype=np.uint64) if numbers else np.empty(0, dtype=np.uint64),
+            errors
+        )
+
+    def __parse_ip(self, field: bytes) -> int:
+        """
+        Packs a dotted-quad literal in one split. Returns the negated error code on failure
+        """
+
+        parts = field.split(b'.')
+        if len(parts) != 4:
+            return -self.ERROR_BYTES_LENGTH
+        if not all(p.isdigit() for p in parts):
+            return -self.ERROR_NOT_A_NUMBER
+
+        a, b, c, d = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
+        if a > 255 or b > 255 or c > 255 or d > 255:
+            return -self.ERROR_BYTE_OFF_LIMITS
+
+        return (a << 24) | (b << 16) | (c << 8) | d
+
+    def __diagnose_mask(self, field: bytes) -> int:
+        if field.isdigit():
+            return self.ERROR_MASK_OFF_BOUNDS
+
+        code = -self.__parse_ip(field)
+        return code if code > 0 else self.ERROR_INCORRECT_MASK
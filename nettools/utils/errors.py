@@ -85,6 +85,9 @@ class MaskTooSmallException(Exception):
         self.advised = advised
 
     def __repr__(self):
+        if self.advised is None:
+            return f"Given mask length ({self.given}) cannot handle all the addresses of the subnetworks, " \
+                   f"which do not fit in IPv4"
         return f"Given mask length ({self.given}) cannot handle all the addresses of the subnetworks. " \
                f"Advised length : {self.advised}"
 
@@ -92,6 +95,29 @@ class MaskTooSmallException(Exception):
         return self.__repr__()
 
 
+# ALLOCATION ERRORS
+class NoFreeBlockException(Exception):
+    def __init__(self, length):
+        self.length = length
+
+    def __repr__(self):
+        return f"No free block left for a /{self.length} subnetwork"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class BlockNotAllocatedException(Exception):
+    def __init__(self, block):
+        self.block = block
+
+    def __repr__(self):
+        return f"Block {self.block} is not allocated"
+
+    def __str__(self):
+        return self.__repr__()
+
+
 # RFC EXCEPTIONS
 class RFCRulesIPWrongRangeException(Exception):
     def __init__(self, first, second):
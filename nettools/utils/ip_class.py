@@ -1,7 +1,10 @@
-from typing import Any, Union
+from typing import Any, Union, List
 from .errors import ByteNumberOffLimitsException, BytesLengthException
 
 
+IPV4_MAX = 0xFFFFFFFF
+
+
 class LimitedList:
 
     __limit = None
@@ -58,97 +61,268 @@ class LimitedList:
         return self
 
 
+class IPv4Address:
+    """
+    Compact, immutable IPv4 address holding a single 32 bits integer.
+
+    Bytes can still be read by index or iteration, so it can be used wherever a full FourBytesLiteral was read.
+    """
+
+    __slots__ = ('__value',)
+
+    # Dunders
+    def __init__(self, value: int = 0) -> None:
+        if not (0 <= value <= IPV4_MAX):
+            raise ValueError(f"IPv4 address integer must be between 0 and {IPV4_MAX}, found {value}")
+        self.__value = value
+
+    def __int__(self) -> int:
+        return self.__value
+
+    def __index__(self) -> int:
+        return self.__value
+
+    def __getitem__(self, item) -> Union[int, List[int]]:
+        return int_to_bytes(self.__value)[item]
+
+    def __iter__(self):
+        return iter(int_to_bytes(self.__value))
+
+    def __len__(self) -> int:
+        return 4
+
+    def __str__(self):
+        return int_to_literal(self.__value)
+
+    def __repr__(self):
+        return f"IPv4Address('{self}')"
+
+    def __hash__(self):
+        return hash(self.__value)
+
+    def __eq__(self, other):
+        if isinstance(other, IPv4Address):
+            return self.__value == other.__value
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, IPv4Address):
+            return self.__value < other.__value
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, IPv4Address):
+            return self.__value <= other.__value
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, IPv4Address):
+            return self.__value > other.__value
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, IPv4Address):
+            return self.__value >= other.__value
+        return NotImplemented
+
+    def __and__(self, other):
+        return IPv4Address(self.__value & int(other))
+
+    def __or__(self, other):
+        return IPv4Address(self.__value | int(other))
+
+    def __invert__(self):
+        return IPv4Address(self.__value ^ IPV4_MAX)
+
+    # Properties
+    @property
+    def value(self) -> int:
+        return self.__value
+
+    @property
+    def bytes_list(self) -> list:
+        return int_to_bytes(self.__value)
+
+    # Constructors
+    @staticmethod
+    def from_literal(literal: str):
+        return IPv4Address(literal_to_int(literal))
+
+    @staticmethod
+    def from_bytes(bytes_: list):
+        return IPv4Address(bytes_to_int(bytes_))
+
+
 class FourBytesLiteral:
+    """
+    Mutable compatibility façade over a packed 32 bits integer.
 
-    __bytes: LimitedList = None
+    The bytes are not stored as a list anymore: `bytes` and `bytes_list` are built on demand,
+    so mutating them does not change the literal. Use item assignment on the literal itself instead.
+    """
+
+    __slots__ = ('__value', '__length')
 
     # Dunders
+    def __init__(self) -> None:
+        self.__value = 0
+        self.__length = 0
+
     def __getitem__(self, item) -> Any:
-        return self.__bytes[item] if self.__bytes else None
+        return self.bytes_list[item] if self.__length else None
 
     def __setitem__(self, key, value) -> None:
-        self.__bytes[key] = value
+        if key < 0:
+            key += self.__length
+        if not (0 <= key < self.__length):
+            raise IndexError("list assignment index out of range")
+        check_byte("literal", value, key)
+
+        shift = 8 * (3 - key)
+        self.__value = (self.__value & (IPV4_MAX ^ (255 << shift))) | (value << shift)
+
+    def __iter__(self):
+        return iter(self.bytes_list or [])
 
     def __len__(self) -> int:
-        return len(self.__bytes)
+        return self.__length
+
+    def __int__(self) -> int:
+        return self.__value
+
+    def __index__(self) -> int:
+        return self.__value
 
     def __str__(self):
-        return ".".join([str(i) for i in self.__bytes]) if self.bytes else "No literal"
+        return ".".join([str(i) for i in self.bytes_list]) if self.__length else "No literal"
 
     def __copy__(self):
-        return FourBytesLiteral().set_eval(self.bytes) if self.__bytes else FourBytesLiteral()
+        copy = FourBytesLiteral()
+        copy.__value, copy.__length = self.__value, self.__length
+        return copy
 
     # Properties & getters
     @property
-    def bytes(self) -> LimitedList:
-        return self.__bytes
+    def bytes(self) -> Union[LimitedList, None]:
+        return LimitedList(4).append_all(self.bytes_list) if self.__length else None
 
     @property
-    def bytes_list(self) -> list:
-        return self.__bytes.content if self.__bytes else None
+    def bytes_list(self) -> Union[list, None]:
+        return int_to_bytes(self.__value)[:self.__length] if self.__length else None
+
+    @property
+    def address(self) -> IPv4Address:
+        return IPv4Address(self.__value)
 
     def index(self, i: Any) -> int:
-        return self.__bytes.index(i) if self.__bytes else None
+        return self.bytes_list.index(i) if self.__length else None
 
     def append(self, obj: Any) -> None:
-        if self.__bytes is None:
-            self.__bytes = LimitedList(4)
-        self.__bytes.append(obj)
+        if self.__length == 4:
+            raise OverflowError("LimitedList limit reached")
+        check_byte("literal", obj, self.__length)
+
+        self.__value |= obj << (8 * (3 - self.__length))
+        self.__length += 1
 
     # Setters (possibility of chaining)
-    def set_eval(self, value: Union[str, LimitedList, list]):
+    def set_eval(self, value: Union[str, LimitedList, list, int, IPv4Address]):
         if isinstance(value, str):
             self.set_from_string_literal(value)
         elif isinstance(value, LimitedList):
             self.set_from_limited_list(value)
         elif isinstance(value, list):
             self.set_from_builtin_list(value)
+        elif isinstance(value, (int, IPv4Address)):
+            self.set_from_int(int(value))
         else:
-            raise Exception("Formats can only be string literals, builtin lists or LimitedList instances")
+            raise Exception("Formats can only be string literals, builtin lists, integers, IPv4Address or "
+                            "LimitedList instances")
 
         return self
 
     def set_from_string_literal(self, value: str):
-        check_fbl(value)
-        self.__bytes = LimitedList(4).append_all([int(i) for i in value.split('.')])
-
-        return self
+        return self.set_from_int(literal_to_int(value))
 
     def set_from_limited_list(self, value: LimitedList):
         if value.limit != 4:
             raise Exception("IPv4 LimitedList must be capped at 4")
 
-        to_set = value.__copy__()
         # Allow partial filling
-        if to_set.length < 4:
-            for _ in range(4 - to_set.length):
-                to_set.append(0)
-
-        self.__bytes = to_set
-
-        return self
+        return self.set_from_int(bytes_to_int(value.content))
 
     def set_from_builtin_list(self, value: list):
         if len(value) > 4:
             raise Exception("IPv4 bytes must be capped at 4")
 
         # Allow partial filling
-        if len(value) < 4:
-            for _ in range(4 - len(value)):
-                value.append(0)
+        return self.set_from_int(bytes_to_int(value))
 
-        self.__bytes = LimitedList(4).append_all(value)
+    def set_from_int(self, value: int):
+        if not (0 <= value <= IPV4_MAX):
+            raise ValueError(f"IPv4 address integer must be between 0 and {IPV4_MAX}, found {value}")
+
+        self.__value = value
+        self.__length = 4
 
         return self
 
 
-def check_fbl(literal: str):
-    # FBL stands for FourBytesLiteral
+#
+# Packing helpers
+#
+def check_byte(type_: str, value: int, index: int) -> None:
+    if not (0 <= value <= 255):
+        raise ByteNumberOffLimitsException(type_, value, index)
+
+
+def bytes_to_int(bytes_: list) -> int:
+    """
+    Packs up to four bytes into an integer, missing trailing bytes being filled with 0.
+
+    :raises:
+        ByteNumberOffLimitsException: If a byte is not between 0 and 255
+    """
+
+    value = 0
+    for i in range(4):
+        byte = bytes_[i] if i < len(bytes_) else 0
+        check_byte("literal", byte, i)
+        value = (value << 8) | byte
+
+    return value
+
+
+def int_to_bytes(value: int) -> list:
+    return [(value >> 24) & 255, (value >> 16) & 255, (value >> 8) & 255, value & 255]
+
+
+def int_to_literal(value: int) -> str:
+    return f"{(value >> 24) & 255}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def literal_to_int(literal: str) -> int:
+    """
+    Parses a dotted-quad literal into an integer, splitting and converting it only once.
+
+    :raises:
+        BytesLengthException: If the literal is not 4 bytes long
+        ByteNumberOffLimitsException: If a byte is not between 0 and 255
+    """
+
     split = [int(i) for i in literal.split('.')]
 
     if len(split) != 4:
         raise BytesLengthException("literal", len(split))
 
-    for i in split:
-        if not (0 <= i <= 255):
-            raise ByteNumberOffLimitsException("literal", i, split.index(i))
+    value = 0
+    for i in range(4):
+        check_byte("literal", split[i], i)
+        value = (value << 8) | split[i]
+
+    return value
+
+
+def check_fbl(literal: str):
+    # FBL stands for FourBytesLiteral
+    literal_to_int(literal)
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable
+
+
+class NetworkCache:
+    """
+    Size-bounded cache with hits, misses and evictions counters. Thread-safe.
+
+    The eviction policy is either 'lru' (least recently used entry evicted first) or 'fifo'
+    (oldest inserted entry evicted first, reads do not refresh entries).
+    """
+
+    policies = ['lru', 'fifo']
+
+    __maxsize: int = None
+    __eviction: str = None
+    __entries: OrderedDict = None
+    __lock: Lock = None
+
+    __hits, __misses, __evictions = 0, 0, 0
+
+    def __init__(self, maxsize: int = 4096, eviction: str = 'lru') -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be strictly positive")
+        if eviction not in self.policies:
+            raise ValueError(f"Eviction policy must be one of {self.policies}, found {eviction}")
+
+        self.__maxsize = maxsize
+        self.__eviction = eviction
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    #
+    # Properties
+    #
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @property
+    def eviction(self) -> str:
+        return self.__eviction
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "evictions": self.__evictions,
+            "size": len(self.__entries),
+            "maxsize": self.__maxsize
+        }
+
+    #
+    # Dunders
+    #
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    #
+    # Accesses
+    #
+    def get(self, key: Hashable) -> Any:
+        """
+        Returns the cached value, or None on a miss
+        """
+
+        with self.__lock:
+            value = self.__entries.get(key)
+            if value is None:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            if self.__eviction == 'lru':
+                self.__entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries[key] = value
+                if self.__eviction == 'lru':
+                    self.__entries.move_to_end(key)
+                return
+
+            self.__entries[key] = value
+            if len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits, self.__misses, self.__evictions = 0, 0, 0
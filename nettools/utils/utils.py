@@ -1,6 +1,12 @@
-from nettools.utils.errors import IPv4LimitError
-from nettools.utils.ip_class import FourBytesLiteral
-from typing import Dict
+from nettools.utils.errors import IPv4LimitError, MaskLengthOffBoundsException, IncorrectMaskException
+from nettools.utils.ip_class import FourBytesLiteral, IPV4_MAX, literal_to_int, int_to_literal
+from typing import Dict, Iterable, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+MASKS_BY_LENGTH = [(IPV4_MAX << (32 - i)) & IPV4_MAX for i in range(33)]
 
 
 class Utils:
@@ -13,6 +19,14 @@ class Utils:
     ]
     rfc_masks = [16, 12, 8]
 
+    # Lookup tables for the 33 valid masks
+    masks_by_length = MASKS_BY_LENGTH
+    mask_lengths_by_int = {m: i for i, m in enumerate(MASKS_BY_LENGTH)}
+    mask_lengths_by_literal = {
+        **{str(i): i for i in range(33)},
+        **{int_to_literal(m): i for i, m in enumerate(MASKS_BY_LENGTH)}
+    }
+
     @staticmethod
     def switch_length(mask_length: int, index=False) -> int:
         if index:
@@ -36,46 +50,76 @@ class Utils:
             result = "255.255.255.{}".format(Utils.switch_length(mask_length))
         return result
 
+    @staticmethod
+    def mask_to_length(mask: Union[str, int]) -> int:
+        """
+        Converts a mask given by its length or its literal into its length
+
+        :raises:
+            MaskLengthOffBoundsException: If the mask length is not between 0 and 32
+            IncorrectMaskException: If the mask literal is not a contiguous mask
+        """
+
+        if isinstance(mask, str) and '.' in mask:
+            length = Utils.mask_lengths_by_int.get(literal_to_int(mask))
+            if length is None:
+                raise IncorrectMaskException(is_out_allowed=True, value=mask)
+            return length
+
+        length = int(mask)
+        if not (0 <= length <= 32):
+            raise MaskLengthOffBoundsException(mask)
+        return length
+
+    @staticmethod
+    def mask_length_to_int(mask_length: int) -> int:
+        return MASKS_BY_LENGTH[mask_length]
+
+    @staticmethod
+    def required_machine_bits(size: int) -> int:
+        """
+        Smallest number of machine bits (at least 1) giving a subnet of at least `size` computer addresses
+        """
+
+        return max(1, (size + 1).bit_length())
+
+    @staticmethod
+    def required_mask_length(total: int) -> int:
+        """
+        Longest mask length whose block holds `total` addresses (at most 31), None if no IPv4 block does
+        """
+
+        if total > 1 << 32:
+            return None
+        return 32 - max(1, (total - 1).bit_length())
+
+    @staticmethod
+    def blocks_fit(total: int, mask_length: int) -> bool:
+        """
+        Whether subnets whose blocks add up to `total` addresses fit in a network of the given mask length. Blocks
+        are aligned powers of two, so they fit as long as they do not exceed the network
+        """
+
+        return total <= 1 << (32 - mask_length)
+
     #
     # Getters
     #
     @staticmethod
     def ip_before(ip: FourBytesLiteral) -> FourBytesLiteral:
-        def verify(t):
-            if t == [0, 0, 0, 0]:
-                raise IPv4LimitError("bottom")
-
-        def _check(idx, content):
+        value = int(ip)
+        if value == 0:
+            raise IPv4LimitError("bottom")
 
-            if content[idx] == 0:
-                content[idx] = 255
-                return _check(idx - 1, content)
-            else:
-                content[idx] = content[idx] - 1
-                return content
-
-        ip_ = ip.bytes_list.copy()
-        verify(ip_)
-        return FourBytesLiteral().set_eval(_check(3, ip_))
+        return FourBytesLiteral().set_from_int(value - 1)
 
     @staticmethod
     def ip_after(ip: FourBytesLiteral) -> FourBytesLiteral:
-        def verify(t):
-            if t == [255, 255, 255, 255]:
-                raise IPv4LimitError("top")
-
-        def _check(idx, content):
-
-            if content[idx] == 255:
-                content[idx] = 0
-                return _check(idx - 1, content)
-            else:
-                content[idx] = content[idx] + 1
-                return content
+        value = int(ip)
+        if value == IPV4_MAX:
+            raise IPv4LimitError("top")
 
-        ip_ = ip.bytes_list.copy()
-        verify(ip_)
-        return FourBytesLiteral().set_eval(_check(3, ip_))
+        return FourBytesLiteral().set_from_int(value + 1)
 
     #
     # Checkers
@@ -90,21 +134,53 @@ class Utils:
         :return bool: if the ip is in the list
         """
 
-        start, end = network_range['start'], network_range['end']
-        temp, ip_list = start.__copy__(), []
+        return int(network_range['start']) <= int(ip) <= int(network_range['end'])
 
-        ip_list.append(start.bytes_list)
-        ip_list.append(end.bytes_list)
+    @staticmethod
+    def ips_in_range(network_range: Dict[str, FourBytesLiteral], ips) -> 'np.ndarray':
+        """
+        checks which ips of a batch are in the given network range
 
-        while str(temp) != str(end):
-            temp = Utils.ip_after(temp)
-            ip_list.append(str(temp))
+        :param network_range: the given network range
+        :param ips: an array, IPv4AddressArray or iterable of addresses (see Utils.to_uint32_array)
+        :return np.ndarray: boolean mask, True where the ip is in the range
+        """
 
-        return str(ip) in ip_list
+        values = Utils.to_uint32_array(ips)
+        return (values >= int(network_range['start'])) & (values <= int(network_range['end']))
+
+    @staticmethod
+    def classify_in_bounds(values: 'np.ndarray', start, end) -> 'np.ndarray':
+        """
+        Vectorized address type: 0 for the network address, 2 for the broadcast one, 1 for the addresses in between
+        and 3 outside of the range. start and end can be scalars or arrays aligned with values.
+        """
+
+        import numpy as np
+
+        result = np.full(len(values), 3, dtype=np.uint8)
+        result[(values > start) & (values < end)] = 1
+        result[values == end] = 2
+        result[values == start] = 0
+        return result
 
     #
     # Others
     #
+    @staticmethod
+    def to_uint32_array(values: Union['np.ndarray', Iterable]) -> 'np.ndarray':
+        """
+        Converts a batch of addresses into a uint32 array. Arrays (and objects exposing __array__) are not copied when
+        already uint32; iterables can hold integers, literals, FourBytesLiteral or IPv4Address instances.
+        """
+
+        import numpy as np
+
+        if isinstance(values, np.ndarray) or hasattr(values, '__array__'):
+            return np.asarray(values, dtype=np.uint32)
+
+        return np.fromiter((literal_to_int(v) if isinstance(v, str) else int(v) for v in values), dtype=np.uint32)
+
     @staticmethod
     def to_literal(x):
         return ".".join([str(i) for i in x])
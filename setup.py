@@ -4,8 +4,8 @@ from subprocess import check_output, SubprocessError
 
 DOCLINES = (__doc__ or '').split("\n")
 
-if sys.version_info[:2] < (3, 6):
-    raise RuntimeError("Python version >= 3.6 required.")
+if sys.version_info[:2] < (3, 7):
+    raise RuntimeError("Python version >= 3.7 required.")
 
 
 MAJOR = 2
@@ -102,9 +102,10 @@ def setup_package():
             "Operating System :: OS Independent",
         ],
 
-        python_requires='>=3.6',
+        python_requires='>=3.7',
+        install_requires=['numpy'],
         zip_safe=False,
-        scripts=['bin/runtests']
+        scripts=['bin/runtests', 'bin/nettools-client']
     )
 
 
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from nettools import *
+from nettools import collapse, collapse_arrays, summarize, IPv4AddressArray, IPv4NetworkArray
+
+
+class AggregationTests(unittest.TestCase):
+
+    def test_collapse_adjacent(self):
+        result = collapse(['192.168.0.0/24', '192.168.1.0/24', '192.168.2.0/23'])
+        self.assertEqual(['192.168.0.0/22'], [str(n) for n in result])
+
+    def test_collapse_overlapping_and_duplicates(self):
+        result = collapse([
+            '10.0.0.0/8', '10.1.0.0/16', '10.1.0.0/16', FrozenIPv4Network.from_cidr('11.0.0.0/8'),
+            IPv4Network().init_from_cidr('192.168.1.0/24'), '192.168.2.0/24'
+        ])
+        self.assertEqual(['10.0.0.0/7', '192.168.1.0/24', '192.168.2.0/24'], [str(n) for n in result])
+
+    def test_collapse_unaligned_union(self):
+        result = collapse(['10.0.0.1/32', '10.0.0.2/31', '10.0.0.4/30'])
+        self.assertEqual(['10.0.0.1/32', '10.0.0.2/31', '10.0.0.4/30'], [str(n) for n in result])
+
+    def test_collapse_network_array(self):
+        array = IPv4NetworkArray().init_from_cidrs(['10.0.0.0/25', '10.0.0.128/25', '10.0.1.0/24'])
+        self.assertEqual(['10.0.0.0/23'], [str(n) for n in collapse(array)])
+
+    def test_collapse_arrays(self):
+        networks = IPv4AddressArray().init_from_literals(['10.0.1.0', '10.0.0.0', '10.0.3.0']).values
+        result, lengths = collapse_arrays(networks, np.array([24, 24, 24]))
+
+        self.assertEqual(['10.0.0.0', '10.0.3.0'], IPv4AddressArray().init_from_array(result).literals)
+        self.assertEqual([23, 24], lengths.tolist())
+
+    def test_collapse_empty(self):
+        self.assertEqual([], collapse([]))
+
+    def test_summarize(self):
+        self.assertEqual(['192.168.0.1/32', '192.168.0.2/31', '192.168.0.4/30', '192.168.0.8/29'],
+                         [str(n) for n in summarize('192.168.0.1', '192.168.0.15')])
+        self.assertEqual(['0.0.0.0/0'], [str(n) for n in summarize(0, 2 ** 32 - 1)])
+        self.assertRaises(ValueError, lambda: summarize('10.0.0.2', '10.0.0.1'))
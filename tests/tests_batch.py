@@ -0,0 +1,92 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from nettools import *
+from nettools.core.batch import parse_query, iter_results, run_batch, BATCH_FORMATS
+
+
+QUERIES = [
+    '192.168.1.4 24',
+    '10.0.0.0/8',
+    '',
+    'builder 192.168.0.0/22 250 100',
+    'net 300.1.1.1 24',
+    'builder 192.168.0.0 24',
+    '# comment',
+    'network 172.16.0.1 255.255.0.0',
+    'foo'
+]
+
+
+class BatchTests(unittest.TestCase):
+
+    def test_parse_query(self):
+        self.assertEqual(24, parse_query('192.168.1.4 255.255.255.0').mask_length)
+        self.assertEqual(8, parse_query('net 10.0.0.1/8').mask_length)
+        self.assertIsInstance(parse_query('snb 192.168.0.0 22 100 20'), IPv4NetworkCompound)
+        self.assertEqual(2, len(parse_query('builder 192.168.0.0/22 100 20').subnets))
+        self.assertIsNone(parse_query('   '))
+        self.assertIsNone(parse_query('# 10.0.0.0/8'))
+
+        self.assertRaises(ValueError, lambda: parse_query('10.0.0.1 8 9'))
+        self.assertRaises(ValueError, lambda: parse_query('builder'))
+        self.assertRaises(ValueError, lambda: parse_query('builder 10.0.0.0/8 a'))
+        self.assertRaises(MaskTooSmallException, lambda: parse_query('builder 192.168.0.0/24 500'))
+
+    def test_results_keep_going_after_errors(self):
+        results = list(iter_results(QUERIES))
+
+        self.assertEqual([1, 2, 4, 5, 6, 8, 9], [line for line, _ in results])
+        self.assertEqual([5, 6, 9], [line for line, result in results if isinstance(result, str)])
+
+    def test_ndjson(self):
+        stream, errors = io.StringIO(), io.StringIO()
+        self.assertEqual(3, run_batch(QUERIES, stream, 'ndjson', errors))
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([1, 2, 4, 4, 8], [r['line'] for r in records])
+        self.assertEqual({'line': 1, 'query': 'network', 'network': '192.168.1.0/24', 'start': '192.168.1.0',
+                          'end': '192.168.1.255', 'mask_length': 24, 'addresses': 254, 'address_type': 'computer',
+                          'requested': None}, records[0])
+        self.assertEqual(('192.168.1.0', 25, 126, 100), (records[3]['start'], records[3]['mask_length'],
+                                                         records[3]['addresses'], records[3]['requested']))
+
+        self.assertEqual(['line 5', 'line 6', 'line 9'], [e.split(':')[0] for e in errors.getvalue().splitlines()])
+
+    def test_csv(self):
+        stream = io.StringIO()
+        run_batch(QUERIES[:4], stream, 'csv')
+
+        self.assertEqual([
+            'line,query,network,start,end,mask_length,addresses,address_type,requested',
+            '1,network,192.168.1.0/24,192.168.1.0,192.168.1.255,24,254,computer,',
+            '2,network,10.0.0.0/8,10.0.0.0,10.255.255.255,8,16777214,network,',
+            '4,builder,192.168.0.0/22,192.168.0.0,192.168.0.255,24,254,,250',
+            '4,builder,192.168.0.0/22,192.168.1.0,192.168.1.127,25,126,,100'
+        ], stream.getvalue().splitlines())
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, lambda: run_batch(QUERIES, io.StringIO(), 'xml'))
+
+    def test_cli_formats(self):
+        from nettools import __main__
+        self.assertEqual(BATCH_FORMATS, __main__.BATCH_FORMATS)
+
+    def test_cli_undecodable_line(self):
+        queries = b'10.0.0.0/8\n\xff\xfe 24\n192.168.1.0/24\n'
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'queries.txt')
+            with open(path, 'wb') as file:
+                file.write(queries)
+
+            for file, stdin in ((path, None), ('-', queries)):
+                run = subprocess.run([sys.executable, '-m', 'nettools', 'batch', file], input=stdin,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                self.assertEqual(1, run.returncode)
+                self.assertEqual([1, 3], [json.loads(record)['line'] for record in run.stdout.splitlines()])
+                self.assertTrue(run.stderr.startswith(b'line 2: '))
@@ -0,0 +1,73 @@
+import unittest
+from nettools.core.buddy_allocator import BuddyAllocator
+from nettools.utils.errors import NoFreeBlockException, BlockNotAllocatedException
+from nettools.utils.ip_class import literal_to_int
+
+
+class BuddyAllocatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.base = literal_to_int('192.168.0.0')
+        self.allocator = BuddyAllocator(self.base, 22)
+
+    def test_allocate_packs_lowest_first(self):
+        self.assertEqual(self.base, self.allocator.allocate(250))
+        self.assertEqual(self.base + 256, self.allocator.allocate_prefix(25))
+        self.assertEqual(self.base + 512, self.allocator.allocate(200))
+        self.assertEqual(self.base + 384, self.allocator.allocate_prefix(26))
+
+        self.assertEqual(4, len(self.allocator))
+        self.assertEqual(1024 - 256 - 128 - 256 - 64, self.allocator.free_addresses)
+
+    def test_smallest_free_block_is_used(self):
+        first = self.allocator.allocate_prefix(24)
+        self.allocator.allocate_prefix(23)
+        self.allocator.allocate_prefix(24)
+        self.allocator.free(first)
+
+        # The free /24 is used rather than a split of nothing larger
+        self.assertEqual(first, self.allocator.allocate_prefix(26))
+
+    def test_free_coalesces_buddies(self):
+        blocks = [self.allocator.allocate_prefix(24) for _ in range(4)]
+        self.assertRaises(NoFreeBlockException, lambda: self.allocator.allocate_prefix(30))
+
+        for start in blocks:
+            self.allocator.free(start)
+
+        self.assertEqual([(self.base, 22)], self.allocator.free_blocks)
+        self.assertEqual(1024, self.allocator.largest_free_block)
+        self.assertEqual(0, self.allocator.fragmentation)
+
+    def test_fragmentation(self):
+        blocks = [self.allocator.allocate_prefix(24) for _ in range(4)]
+        self.allocator.free(blocks[0])
+        self.allocator.free(blocks[2])
+
+        self.assertEqual(256, self.allocator.largest_free_block)
+        self.assertEqual(0.5, self.allocator.fragmentation)
+        self.assertRaises(NoFreeBlockException, lambda: self.allocator.allocate_prefix(23))
+
+    def test_reserve(self):
+        self.assertEqual(self.base + 640, self.allocator.reserve(self.base + 640, 25))
+        self.assertEqual([(self.base, 23), (self.base + 512, 25), (self.base + 768, 24)], self.allocator.free_blocks)
+
+        self.assertRaises(NoFreeBlockException, lambda: self.allocator.reserve(self.base + 512, 24))
+        self.assertRaises(NoFreeBlockException, lambda: self.allocator.reserve(self.base + 1, 24))
+
+        self.allocator.free(self.base + 640)
+        self.assertEqual([(self.base, 22)], self.allocator.free_blocks)
+
+    def test_errors(self):
+        self.assertRaises(NoFreeBlockException, lambda: self.allocator.allocate_prefix(21))
+        self.assertRaises(BlockNotAllocatedException, lambda: self.allocator.free(self.base))
+
+    def test_churn(self):
+        allocator = BuddyAllocator(literal_to_int('10.0.0.0'), 8)
+        for _ in range(3):
+            blocks = [allocator.allocate(s) for s in range(1, 2000, 7)]
+            for start in blocks:
+                allocator.free(start)
+
+        self.assertEqual(2 ** 24, allocator.free_addresses)
+        self.assertEqual([(literal_to_int('10.0.0.0'), 8)], allocator.free_blocks)
@@ -0,0 +1,66 @@
+import io
+import os
+import tempfile
+import unittest
+from nettools import *
+from nettools import BulkParser, IPv4AddressArray
+
+
+class BulkParserTests(unittest.TestCase):
+    content = "192.168.1.0/24\n" \
+              "10.0.0.1 255.255.0.0\n" \
+              "\n" \
+              "# comment\n" \
+              "172.16.0.4\n" \
+              "192.168.1/24\n" \
+              "192.168.1.300/24\n" \
+              "192.168.a.1/24\n" \
+              "192.168.1.0/33\n" \
+              "192.168.1.0/255.0.255.0\n" \
+              "192.168.1.0/\n" \
+              "192.168.1.0 24 extra\n" \
+              "10.1.2.3/8"
+
+    def check(self, batch):
+        self.assertEqual(['192.168.1.0', '10.0.0.1', '172.16.0.4', '10.1.2.3'],
+                         IPv4AddressArray().init_from_array(batch.ips).literals)
+        self.assertEqual([24, 16, BulkParser.NO_MASK, 8], batch.mask_lengths.tolist())
+        self.assertEqual([1, 2, 5, 13], batch.line_numbers.tolist())
+        self.assertEqual([
+            (6, BulkParser.ERROR_BYTES_LENGTH),
+            (7, BulkParser.ERROR_BYTE_OFF_LIMITS),
+            (8, BulkParser.ERROR_NOT_A_NUMBER),
+            (9, BulkParser.ERROR_MASK_OFF_BOUNDS),
+            (10, BulkParser.ERROR_INCORRECT_MASK),
+            (11, BulkParser.ERROR_MASK_NOT_PROVIDED),
+            (12, BulkParser.ERROR_TOO_MANY_FIELDS),
+        ], batch.errors)
+
+    def test_parse_text(self):
+        self.check(BulkParser().parse_all(io.StringIO(self.content)))
+
+    def test_small_chunks(self):
+        # Lines split across chunks must be rebuilt
+        parser = BulkParser(chunk_size=7)
+        self.check(parser.parse_all(io.BytesIO(self.content.encode())))
+        self.assertGreater(len(list(parser.parse(io.BytesIO(self.content.encode())))), 1)
+
+    def test_parse_file(self):
+        fd, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.content)
+            batches = list(BulkParser(chunk_size=64).parse_file(path))
+            self.assertEqual(4, sum(len(b.ips) for b in batches))
+        finally:
+            os.remove(path)
+
+    def test_require_mask(self):
+        batch = BulkParser(require_mask=True).parse_all(io.StringIO("10.0.0.1\n10.0.0.0/8"))
+
+        self.assertEqual([(1, BulkParser.ERROR_MASK_NOT_PROVIDED)], batch.errors)
+        self.assertEqual([8], batch.mask_lengths.tolist())
+
+    def test_empty(self):
+        batch = BulkParser().parse_all(io.BytesIO(b''))
+        self.assertEqual(0, len(batch.ips))
@@ -0,0 +1,79 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+if not hasattr(socket, 'AF_UNIX'):
+    raise unittest.SkipTest("Unix sockets are not supported on this platform")
+
+from nettools.core.daemon import NetToolsServer, query
+
+
+class DaemonTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'nettools.sock')
+        self.server = NetToolsServer(self.path, cache_size=16)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_queries(self):
+        answers = [json.loads(a) for a in query(self.path, ['192.168.1.4 24', 'builder 192.168.0.0/22 250 100',
+                                                             'foo', '', '192.168.1.4 24\n'])]
+
+        self.assertEqual({'query': 'network', 'network': '192.168.1.0/24', 'start': '192.168.1.0',
+                          'end': '192.168.1.255', 'mask_length': 24, 'addresses': 254, 'address_type': 'computer',
+                          'requested': None}, answers[0]['records'][0])
+        self.assertEqual(['192.168.0.0', '192.168.1.0'], [r['start'] for r in answers[1]['records']])
+        self.assertIn('error', answers[2])
+        self.assertEqual({'records': []}, answers[3])
+        self.assertEqual(answers[0], answers[4])
+
+    def test_answers_are_cached(self):
+        list(query(self.path, ['10.0.0.1 8', '10.0.0.1 8', ' 10.0.0.1 8 ']))
+        self.assertEqual((2, 1), (self.server.responses.hits, self.server.responses.misses))
+
+    def test_socket_in_use(self):
+        self.assertRaises(OSError, lambda: NetToolsServer(self.path))
+
+    def test_stale_socket_is_replaced(self):
+        self.server.shutdown()
+        self.server.socket.close()
+        self.assertTrue(os.path.exists(self.path))
+
+        server = NetToolsServer(self.path)
+        server.server_close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_other_files_are_kept(self):
+        path = os.path.join(self.directory.name, 'queries.txt')
+        with open(path, 'w') as file:
+            file.write('10.0.0.1 8\n')
+
+        self.assertRaises(FileExistsError, lambda: NetToolsServer(path))
+        self.assertTrue(os.path.exists(path))
+
+    def test_undecodable_query(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(self.path)
+            answers = client.makefile('rb')
+            client.sendall(b'\xff\xfe 24\n10.0.0.1 8\n')
+
+            self.assertIn('error', json.loads(answers.readline()))
+            self.assertEqual('10.0.0.0/8', json.loads(answers.readline())['records'][0]['network'])
+
+    def test_cli_rejects_empty_size(self):
+        run = subprocess.run([sys.executable, '-m', 'nettools', 'serve', self.path, '--size', '0'],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        self.assertEqual(2, run.returncode)
+        self.assertIn("argument --size: expected a number of at least 1", run.stderr)
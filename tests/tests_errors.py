@@ -67,6 +67,11 @@ class ErrorsInstanciationTests(unittest.TestCase):
         self.assertEqual([m.call("Given mask length (16) cannot handle all the addresses of the subnetworks. "
                                  "Advised length : 14")], mocked_print.mock_calls)
 
+        mocked_print.reset_mock()
+        print(str(e.MaskTooSmallException(8, None)))
+        self.assertEqual([m.call("Given mask length (8) cannot handle all the addresses of the subnetworks, which do "
+                                 "not fit in IPv4")], mocked_print.mock_calls)
+
     @m.patch(b)
     def test_rfc_ip_wrong_range_exception(self, mocked_print):
         inst = e.RFCRulesIPWrongRangeException(16, 14)
@@ -106,3 +111,17 @@ class ErrorsInstanciationTests(unittest.TestCase):
 
         self.assertEqual([m.call("IPv4 top limit (255.255.255.255) reached")],
                          mocked_print.mock_calls)
+
+    @m.patch(b)
+    def test_no_free_block_exception(self, mocked_print):
+        inst = e.NoFreeBlockException(24)
+        print(str(inst))
+
+        self.assertEqual([m.call("No free block left for a /24 subnetwork")], mocked_print.mock_calls)
+
+    @m.patch(b)
+    def test_block_not_allocated_exception(self, mocked_print):
+        inst = e.BlockNotAllocatedException('192.168.1.0/24')
+        print(str(inst))
+
+        self.assertEqual([m.call("Block 192.168.1.0/24 is not allocated")], mocked_print.mock_calls)
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+from nettools import *
+
+
+class FrozenIPv4NetworkTests(unittest.TestCase):
+
+    def test_normalization(self):
+        net = FrozenIPv4Network.from_cidr('192.168.1.42/24')
+
+        self.assertEqual('192.168.1.0/24', str(net))
+        self.assertEqual('192.168.1.255', str(net.broadcast))
+        self.assertEqual('255.255.255.0', str(net.mask))
+        self.assertEqual(254, net.addresses)
+        self.assertEqual(256, len(net))
+
+    def test_constructors(self):
+        expected = FrozenIPv4Network(0xC0A80100, 24)
+
+        self.assertEqual(expected, FrozenIPv4Network.from_couple('192.168.1.0', '255.255.255.0'))
+        self.assertEqual(expected, FrozenIPv4Network.from_network(IPv4Network().init_from_cidr('192.168.1.4/24')))
+        self.assertEqual(expected.network_bounds, expected.to_network().network_bounds)
+
+        self.assertRaises(MaskNotProvided, lambda: FrozenIPv4Network.from_cidr('192.168.1.0'))
+        self.assertRaises(MaskLengthOffBoundsException, lambda: FrozenIPv4Network(0, 33))
+
+    def test_hash_and_ordering(self):
+        nets = [FrozenIPv4Network.from_cidr(c) for c in ['10.0.0.0/16', '10.0.0.0/8', '10.0.0.5/16', '8.8.8.0/24']]
+
+        self.assertEqual(3, len(set(nets)))
+        self.assertEqual(['8.8.8.0/24', '10.0.0.0/8', '10.0.0.0/16', '10.0.0.0/16'], [str(n) for n in sorted(nets)])
+        self.assertTrue(nets[1] <= nets[0])
+
+    def test_immutable(self):
+        net = FrozenIPv4Network.from_cidr('10.0.0.0/8')
+
+        self.assertRaises(AttributeError, lambda: setattr(net, 'other', 1))
+        self.assertRaises(AttributeError, lambda: setattr(net, '_FrozenIPv4Network__network', 1))
+
+    def test_contains(self):
+        net = FrozenIPv4Network.from_cidr('10.0.0.0/8')
+
+        self.assertIn('10.200.0.1', net)
+        self.assertNotIn(IPv4Address.from_literal('11.0.0.0'), net)
+
+    def test_pickle(self):
+        net = FrozenIPv4Network.from_cidr('172.16.0.0/12')
+        self.assertEqual(net, pickle.loads(pickle.dumps(net)))
@@ -1,5 +1,5 @@
 import unittest
-from nettools import FourBytesLiteral, LimitedList
+from nettools import FourBytesLiteral, LimitedList, IPv4Address, ByteNumberOffLimitsException
 
 
 class FBLTests(unittest.TestCase):
@@ -47,6 +47,64 @@ class FBLTests(unittest.TestCase):
 
         self.assertEqual([192, 168, 0, 0], inst.bytes_list)
 
+    # Integer backing
+    def test_int_conversion(self):
+        inst = self.inst_fbl()
+        self.assertEqual(0xC0A80100, int(inst))
+        self.assertEqual('192.168.1.0', str(FourBytesLiteral().set_eval(0xC0A80100)))
+
+    def test_set_item_keeps_int(self):
+        test = self.inst_fbl()
+        test[3] = 255
+
+        self.assertEqual(0xC0A801FF, int(test))
+
+    def test_append(self):
+        inst = FourBytesLiteral()
+        inst.append(10)
+        inst.append(2)
+
+        self.assertEqual([10, 2], inst.bytes_list)
+        self.assertEqual(2, len(inst))
+
+    def test_exception_byte_off_limits(self):
+        self.assertRaises(ByteNumberOffLimitsException, lambda: FourBytesLiteral().set_eval('192.168.1.256'))
+        self.assertRaises(ByteNumberOffLimitsException, lambda: FourBytesLiteral().set_eval([192, 300]))
+
+
+class IPv4AddressTests(unittest.TestCase):
+
+    def test_from_literal(self):
+        inst = IPv4Address.from_literal('10.0.1.2')
+
+        self.assertEqual(0x0A000102, int(inst))
+        self.assertEqual('10.0.1.2', str(inst))
+        self.assertEqual([10, 0, 1, 2], list(inst))
+        self.assertEqual(1, inst[2])
+
+    def test_from_bytes(self):
+        self.assertEqual(IPv4Address.from_literal('192.168.0.0'), IPv4Address.from_bytes([192, 168]))
+
+    def test_hash_and_ordering(self):
+        a, b = IPv4Address.from_literal('10.0.0.1'), IPv4Address.from_literal('10.0.0.2')
+
+        self.assertEqual(2, len({a, b, IPv4Address(int(a))}))
+        self.assertLess(a, b)
+        self.assertEqual([a, b], sorted([b, a]))
+
+    def test_bitwise(self):
+        ip = IPv4Address.from_literal('192.168.1.42')
+        mask = IPv4Address.from_literal('255.255.255.0')
+
+        self.assertEqual('192.168.1.0', str(ip & mask))
+        self.assertEqual('192.168.1.255', str(ip | ~mask))
+
+    def test_slots(self):
+        self.assertRaises(AttributeError, lambda: setattr(IPv4Address(), 'other', 1))
+
+    def test_exception_off_limits(self):
+        self.assertRaises(ValueError, lambda: IPv4Address(2 ** 32))
+
 
 class LLTests(unittest.TestCase):
 
@@ -0,0 +1,54 @@
+import unittest
+from nettools import *
+from nettools import IPv4AddressSet, IPv4AddressArray
+
+
+def cidrs(address_set):
+    return [str(n) for n in address_set.to_networks()]
+
+
+class IPv4AddressSetTests(unittest.TestCase):
+
+    def test_build(self):
+        test = IPv4AddressSet(['10.0.1.0/24', '10.0.0.0/24', '10.0.0.128/25', '10.0.3.0/24'])
+
+        self.assertEqual(['10.0.0.0/23', '10.0.3.0/24'], cidrs(test))
+        self.assertEqual(768, test.size)
+        self.assertEqual(['10.0.0.0', '10.0.3.0'], IPv4AddressArray().init_from_array(test.intervals[0]).literals)
+
+    def test_compound_free_space(self):
+        compound = IPv4NetworkCompound().init_from_cidr('10.0.0.0/8').add_from_addresses([250, 60000])
+        reserved = IPv4AddressSet(['10.255.0.0/16'])
+
+        free = IPv4AddressSet(['10.0.0.0/8']) - IPv4AddressSet(compound.subnets) - reserved
+        self.assertEqual(2 ** 24 - 2 ** 16 - 256 - 2 ** 16, free.size)
+        self.assertNotIn('10.0.0.4', free)
+        self.assertIn('10.1.1.0', free)
+
+    def test_operations(self):
+        a = IPv4AddressSet.from_range('10.0.0.0', '10.0.0.99')
+        b = IPv4AddressSet.from_range('10.0.0.50', '10.0.0.149')
+
+        self.assertEqual(IPv4AddressSet.from_range('10.0.0.0', '10.0.0.149'), a | b)
+        self.assertEqual(IPv4AddressSet.from_range('10.0.0.50', '10.0.0.99'), a & b)
+        self.assertEqual(IPv4AddressSet.from_range('10.0.0.0', '10.0.0.49'), a - b)
+        self.assertEqual(100, (a ^ b).size)
+        self.assertEqual(['10.0.0.0/27', '10.0.0.32/28', '10.0.0.48/31'], cidrs(a - b))
+
+    def test_inclusion(self):
+        big, small = IPv4AddressSet(['10.0.0.0/8']), IPv4AddressSet(['10.1.0.0/16', '10.3.0.0/16'])
+
+        self.assertTrue(small <= big)
+        self.assertTrue(big >= small)
+        self.assertFalse(big <= small)
+        self.assertFalse(IPv4AddressSet() - big)
+
+    def test_contains_batch(self):
+        test = IPv4AddressSet(['10.0.0.0/24', '192.168.0.0/16'])
+        self.assertEqual([True, False, True, False],
+                         test.contains(['10.0.0.255', '10.0.1.0', '192.168.200.1', '0.0.0.0']).tolist())
+
+    def test_empty(self):
+        self.assertEqual(0, IPv4AddressSet().size)
+        self.assertEqual([], cidrs(IPv4AddressSet() | IPv4AddressSet()))
+        self.assertEqual([False], IPv4AddressSet().contains(['10.0.0.0']).tolist())
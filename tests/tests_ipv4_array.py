@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+from nettools import *
+from nettools import IPv4AddressArray, IPv4NetworkArray
+
+
+class IPv4AddressArrayTests(unittest.TestCase):
+
+    def test_init_from_literals(self):
+        inst = IPv4AddressArray().init_from_literals(['192.168.1.0', '10.0.0.1'])
+
+        self.assertEqual(np.uint32, inst.values.dtype)
+        self.assertEqual([0xC0A80100, 0x0A000001], inst.values.tolist())
+        self.assertEqual(['192.168.1.0', '10.0.0.1'], inst.literals)
+        self.assertEqual(IPv4Address.from_literal('10.0.0.1'), inst[1])
+
+    def test_exception_literal(self):
+        self.assertRaises(ByteNumberOffLimitsException,
+                          lambda: IPv4AddressArray().init_from_literals(['192.168.1.256']))
+
+
+class IPv4NetworkArrayTests(unittest.TestCase):
+    couples = [('192.168.1.0', 24), ('192.168.1.4', '255.255.255.0'), ('10.0.5.255', 22), ('172.16.0.0', 11)]
+
+    def inst(self):
+        return IPv4NetworkArray().init_from_couples([c[0] for c in self.couples], [c[1] for c in self.couples])
+
+    def test_matches_ipv4_network(self):
+        inst = self.inst()
+        netr = inst.network_range
+
+        for i, (ip, mask) in enumerate(self.couples[:3]):
+            net = IPv4Network().init_from_couple(ip, mask)
+            self.assertEqual(net.network_bounds, (int(netr['start'][i]), int(netr['end'][i])))
+            self.assertEqual(net.mask_length, inst.mask_lengths[i])
+            self.assertEqual(net.addresses, inst.addresses[i])
+            self.assertEqual(net.address_type, inst.address_type[i])
+
+    def test_init_from_cidrs(self):
+        inst = IPv4NetworkArray().init_from_cidrs(['192.168.1.0/24', '10.0.0.0/8'])
+
+        self.assertEqual([24, 8], inst.mask_lengths.tolist())
+        self.assertRaises(MaskNotProvided, lambda: IPv4NetworkArray().init_from_cidrs(['192.168.1.0']))
+
+    def test_rfc(self):
+        inst = IPv4NetworkArray().init_from_cidrs(['192.168.1.0/24', '172.16.0.0/11', '100.0.0.0/8', '10.0.0.0/8'])
+
+        self.assertEqual([0, 1, -1, 2], inst.rfc_ranges.tolist())
+        self.assertEqual([True, False, False, True], inst.rfc_compliant.tolist())
+
+    def test_mask_errors(self):
+        self.assertRaises(MaskLengthOffBoundsException, lambda: IPv4NetworkArray().init_from_arrays([0], [33]))
+        self.assertRaises(IncorrectMaskException,
+                          lambda: IPv4NetworkArray().init_from_couples(['10.0.0.0'], ['255.0.255.0']))
+
+    def test_not_activated(self):
+        self.assertEqual(None, IPv4NetworkArray().network_range)
@@ -1,5 +1,6 @@
 import unittest
 from nettools import *
+from nettools import IPv4AddressArray
 import unittest.mock as mock
 
 
@@ -73,6 +74,31 @@ class IPv4NetworkTests(unittest.TestCase):
         for i in range(8, 32):
             IPv4Network().init_from_couple('10.0.0.0', i)
 
+    def test_fast_inits(self):
+        expected = {'start': '10.1.0.0', 'end': '10.1.255.255'}
+
+        self.assertEqual(expected, IPv4Network().init_from_int(0x0A010203, 16).displayable_network_range)
+        self.assertEqual(expected, IPv4Network().init_from_prefix('10.1.2.3', 16).displayable_network_range)
+        self.assertEqual('255.255.0.0', str(IPv4Network().init_from_int(0x0A010203, 16).mask))
+
+        self.assertRaises(MaskLengthOffBoundsException, lambda: IPv4Network().init_from_int(0x0A010203, 33))
+        self.assertRaises(RFCRulesWrongCoupleException, lambda: IPv4Network().init_from_prefix('10.1.2.3', 7))
+
+    def test_init_from_fbl_masks(self):
+        ip = FourBytesLiteral().set_eval('192.168.1.0')
+
+        self.assertEqual(23, IPv4Network().init_from_fbl(ip, FourBytesLiteral().set_eval('255.255.254.0')).mask_length)
+        self.assertRaises(IncorrectMaskException,
+                          lambda: IPv4Network().init_from_fbl(ip, FourBytesLiteral().set_eval('255.0.255.0')))
+
+    def test_classify(self):
+        net = init_couple('192.168.1.4', 24)
+        ips = ['192.168.1.0', '192.168.1.4', '192.168.1.255', '192.168.2.0', '10.0.0.1']
+
+        self.assertEqual([0, 1, 2, 3, 3], net.classify(ips).tolist())
+        self.assertEqual([IPv4Network.TYPE_NETWORK, IPv4Network.TYPE_BROADCAST],
+                         net.classify(IPv4AddressArray().init_from_literals(['192.168.1.0', '192.168.1.255'])).tolist())
+
     #
     # RFC
     #
@@ -217,3 +243,98 @@ class IPv4NetworkDisplays(unittest.TestCase):
             mock.call(''),
             mock.call("The address 192.168.1.255 is a broadcast address")
         ], mocked_print.mock_calls, msg='Fancy display: broadcast address')
+
+
+class IPv4NetworkWalking(unittest.TestCase):
+
+    def test_iter_addresses(self):
+        net = init_cidr('192.168.1.4/30')
+
+        self.assertEqual(['192.168.1.4', '192.168.1.5', '192.168.1.6', '192.168.1.7'],
+                         [str(i) for i in net.iter_addresses()])
+        self.assertEqual(['192.168.1.5', '192.168.1.7'], [str(i) for i in net.iter_addresses(offset=1, stride=2)])
+
+    def test_hosts(self):
+        net = init_cidr('192.168.1.0/24')
+
+        self.assertEqual(254, len(list(net.hosts())))
+        self.assertEqual(['192.168.1.11', '192.168.1.111', '192.168.1.211'],
+                         [str(i) for i in net.hosts(offset=10, stride=100)])
+
+    def test_hosts_is_lazy(self):
+        hosts = init_cidr('10.0.0.0/8').hosts()
+        self.assertEqual('10.0.0.1', str(next(hosts)))
+
+    def test_address_at(self):
+        net = init_cidr('10.0.0.0/8')
+
+        self.assertEqual('10.0.1.0', str(net.address_at(256)))
+        self.assertEqual('10.255.255.255', str(net.address_at(-1)))
+        self.assertRaises(IndexError, lambda: net.address_at(2 ** 24))
+
+    def test_address_chunks(self):
+        net = init_cidr('192.168.0.0/22')
+        chunks = list(net.address_chunks(300, hosts_only=True))
+
+        self.assertEqual([300, 300, 300, 122], [len(c) for c in chunks])
+        self.assertEqual(int(IPv4Address.from_literal('192.168.0.1')), chunks[0][0])
+        self.assertEqual(int(IPv4Address.from_literal('192.168.3.254')), chunks[-1][-1])
+
+        strided = list(net.address_chunks(2, offset=1, stride=512))
+        self.assertEqual([[int(IPv4Address.from_literal('192.168.0.1')),
+                           int(IPv4Address.from_literal('192.168.2.1'))]], [c.tolist() for c in strided])
+
+    def test_walk_errors(self):
+        net = init_cidr('192.168.1.0/24')
+
+        self.assertRaises(ValueError, lambda: list(net.hosts(stride=0)))
+        self.assertRaises(ValueError, lambda: list(net.address_chunks(0)))
+
+
+class IPv4NetworkSubnets(unittest.TestCase):
+
+    def test_iter_subnets(self):
+        net = init_cidr('192.168.0.0/22')
+
+        self.assertEqual(['192.168.0.0', '192.168.2.0'],
+                         [n.displayable_network_range['start'] for n in net.iter_subnets()])
+        self.assertEqual([24] * 4, [n.mask_length for n in net.iter_subnets(prefixlen_diff=2)])
+        self.assertEqual(4, len(list(net.iter_subnets(new_prefix=24))))
+
+    def test_iter_subnets_is_lazy(self):
+        net = init_cidr('10.0.0.0/8')
+        subnets = net.iter_subnets(new_prefix=30)
+
+        self.assertEqual({'start': '10.0.0.4', 'end': '10.0.0.7'}, [next(subnets), next(subnets)][1]
+                         .displayable_network_range)
+        self.assertEqual(2 ** 22, net.subnets_count(new_prefix=30))
+
+    def test_subnet_at(self):
+        net = init_cidr('172.16.0.0/12')
+
+        self.assertEqual({'start': '172.16.5.0', 'end': '172.16.5.255'},
+                         net.subnet_at(5, new_prefix=24).displayable_network_range)
+        self.assertEqual({'start': '172.31.255.0', 'end': '172.31.255.255'},
+                         net.subnet_at(-1, new_prefix=24).displayable_network_range)
+        self.assertRaises(IndexError, lambda: net.subnet_at(2 ** 12, new_prefix=24))
+
+    def test_subnet_chunks(self):
+        chunks = list(init_cidr('10.0.0.0/8').subnet_chunks(1000, new_prefix=20))
+
+        self.assertEqual([1000, 1000, 1000, 1000, 96], [len(c) for c in chunks])
+        self.assertEqual(int(IPv4Address.from_literal('10.0.16.0')), chunks[0][1])
+
+    def test_subnet_errors(self):
+        net = init_cidr('192.168.1.0/24')
+
+        self.assertRaises(ValueError, lambda: list(net.iter_subnets(new_prefix=23)))
+        self.assertRaises(ValueError, lambda: list(net.iter_subnets(new_prefix=33)))
+        self.assertRaises(ValueError, lambda: list(net.iter_subnets(new_prefix=25, prefixlen_diff=1)))
+
+    def test_supernet(self):
+        net = init_cidr('192.168.1.4/24')
+
+        self.assertEqual({'start': '192.168.0.0', 'end': '192.168.1.255'}, net.supernet().displayable_network_range)
+        self.assertEqual(16, net.supernet(new_prefix=16).mask_length)
+        self.assertRaises(ValueError, lambda: net.supernet(new_prefix=25))
+        self.assertRaises(RFCRulesWrongCoupleException, lambda: net.supernet(new_prefix=15))
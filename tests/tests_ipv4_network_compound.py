@@ -1,6 +1,7 @@
 import unittest
 import unittest.mock as m
 from nettools import *
+from nettools.utils.ip_class import literal_to_int
 
 
 def init_cidr(sizes, cidr):
@@ -62,6 +63,173 @@ class IPv4NetworkCompoundTests(unittest.TestCase):
 
         self.assertEqual(expected, test.displayable_subnetworks)
 
+    def test_stable_insertion(self):
+        test = init_cidr([250], '192.168.0.0/18')
+        first = test.subnets[0]
+        test.add_from_addresses([1000, 60], stable=True)
+
+        self.assertIs(first, test.subnets[0])
+        self.assertEqual([
+            {'start': '192.168.0.0', 'end': '192.168.0.255'},
+            {'start': '192.168.1.0', 'end': '192.168.1.63'},
+            {'start': '192.168.4.0', 'end': '192.168.7.255'}
+        ], test.displayable_subnetworks)
+
+    def test_stable_insertion_reuses_freed_space(self):
+        test = init_cidr([250, 250, 250], '192.168.0.0/22')
+        test.remove_subnet(1)
+        test.add_from_addresses(100, stable=True)
+
+        self.assertEqual([
+            {'start': '192.168.0.0', 'end': '192.168.0.255'},
+            {'start': '192.168.1.0', 'end': '192.168.1.127'},
+            {'start': '192.168.2.0', 'end': '192.168.2.255'}
+        ], test.displayable_subnetworks)
+
+    def test_stable_insertion_too_small(self):
+        test = init_cidr([250, 250, 250], '192.168.0.0/22')
+        self.assertRaises(MaskTooSmallException, lambda: test.add_from_addresses([100, 250], stable=True))
+        self.assertEqual(3, len(test.subnets))
+
+    def test_insertion_modes_accept_the_same_subnets(self):
+        for sizes in ([100, 100], [250], [120, 60, 30, 14, 6, 2, 0]):
+            rebuilt = init_cidr(sizes, '192.168.0.0/24')
+            stable = init_cidr(sizes[:1], '192.168.0.0/24').add_from_addresses(sizes[1:], stable=True)
+            self.assertEqual(sorted(n.mask_length for n in rebuilt.subnets),
+                             sorted(n.mask_length for n in stable.subnets))
+
+        self.assertRaises(MaskTooSmallException, lambda: init_cidr([100, 100, 1], '192.168.0.0/24'))
+        self.assertRaises(MaskTooSmallException,
+                          lambda: init_cidr([100, 100], '192.168.0.0/24').add_from_addresses(1, stable=True))
+
+    def test_stable_additions_one_at_a_time(self):
+        test = init_cidr([2], '192.168.0.0/24')
+        for _ in range(63):
+            test.add_from_addresses(2, stable=True)
+        test.remove_subnet(10)
+        test.add_from_addresses(2, stable=True)
+
+        self.assertEqual(64, len(test.subnets))
+        self.assertRaises(MaskTooSmallException, lambda: test.add_from_addresses(2, stable=True))
+
+    def test_failed_additions_change_nothing(self):
+        test = init_cidr([100], '192.168.0.0/24')
+        subnets, stats, usage = list(test.subnets), test.stats, test.subnets_usage
+
+        self.assertRaises(MaskTooSmallException, lambda: test.add_from_addresses(200))
+        self.assertRaises(MaskTooSmallException, lambda: test.add_from_addresses([100, 60], stable=True))
+        self.assertEqual(subnets, test.subnets)
+        self.assertEqual(stats, test.stats)
+        self.assertEqual(usage, test.subnets_usage)
+
+        test.add_from_addresses(10, stable=True)
+        self.assertEqual([SubnetUsage(100, 126), SubnetUsage(10, 14)], test.subnets_usage)
+        self.assertEqual('192.168.0.128', test.subnets[1].displayable_network_range['start'])
+
+        empty = IPv4NetworkCompound().init_from_cidr('192.168.0.0/24')
+        self.assertRaises(MaskTooSmallException, lambda: empty.add_from_addresses(300))
+        self.assertFalse(empty.activated)
+        self.assertEqual([{'start': '192.168.0.0', 'end': '192.168.0.255'}],
+                         empty.add_from_addresses(200).displayable_subnetworks)
+
+    def test_advised_mask_length_fits(self):
+        with self.assertRaises(MaskTooSmallException) as context:
+            init_cidr([200, 450], '192.168.1.4/24')
+
+        self.assertEqual(22, context.exception.advised)
+        init_cidr([200, 450], f'192.168.0.0/{context.exception.advised}')
+
+        with self.assertRaises(MaskTooSmallException) as context:
+            init_cidr([99999999999], '10.0.0.0/8')
+        self.assertIsNone(context.exception.advised)
+        self.assertIn("do not fit in IPv4", str(context.exception))
+
+    def test_removed_subnets_coalesce(self):
+        test = init_cidr([250, 250, 250], '192.168.0.0/22')
+        self.assertRaises(MaskTooSmallException, lambda: test.add_from_addresses(500, stable=True))
+
+        test.remove_subnet(1)
+        self.assertEqual(0.5, test.fragmentation)
+        self.assertRaises(NoFreeBlockException, lambda: test.add_from_addresses(500, stable=True))
+        test.remove_subnet(1)
+        self.assertAlmostEqual(1 / 3, test.fragmentation)
+        test.add_from_addresses(500, stable=True)
+
+        self.assertEqual([
+            {'start': '192.168.0.0', 'end': '192.168.0.255'},
+            {'start': '192.168.2.0', 'end': '192.168.3.255'}
+        ], test.displayable_subnetworks)
+
+    def test_subnet_for(self):
+        test = init_cidr([250, 60, 1000], '192.168.0.0/20')
+
+        self.assertIs(test.subnets[1], test.subnet_for('192.168.4.128'))
+        self.assertIs(test.subnets[0], test.subnet_for(literal_to_int('192.168.0.3')))
+        self.assertIsNone(test.subnet_for('192.168.5.64'))
+        self.assertIsNone(test.subnet_for('10.0.0.1'))
+        self.assertEqual(-1, IPv4NetworkCompound().init_from_cidr('192.168.0.0/20').subnet_index('192.168.0.1'))
+
+    def test_subnet_indexes_follow_changes(self):
+        test = init_cidr([250, 250, 250], '192.168.0.0/22')
+        ips = ['192.168.0.1', '192.168.1.1', '192.168.2.1', '192.168.3.1']
+        self.assertEqual([0, 1, 2, -1], test.subnet_indexes(ips).tolist())
+
+        test.remove_subnet(1)
+        self.assertEqual([0, -1, 1, -1], test.subnet_indexes(ips).tolist())
+
+        test.add_from_addresses([100, 100], stable=True)
+        self.assertEqual([0, 1, 3, -1], test.subnet_indexes(ips).tolist())
+        self.assertEqual(2, test.subnet_index('192.168.1.200'))
+
+    def test_stats(self):
+        test = init_cidr([250, 100], '192.168.0.0/22')
+        self.assertEqual(CompoundStats(2, 1024, 384, 350, 640, 512, 0.2, 0.375), test.stats)
+        self.assertIsNone(IPv4NetworkCompound().init_from_cidr('192.168.0.0/22').stats)
+
+        test.add_from_addresses(20, stable=True)
+        test.remove_subnet(0)
+        stats = test.stats
+        self.assertEqual((2, 160, 120, 864, 512), (stats.subnets, stats.allocated, stats.requested, stats.free,
+                                                   stats.largest_free_block))
+
+        test.add_from_addresses(1, stable=False)
+        self.assertEqual((3, 164, 121), (test.stats.subnets, test.stats.allocated, test.stats.requested))
+
+    def test_subnets_usage(self):
+        test = init_cidr([250, 100], '192.168.0.0/22')
+        self.assertEqual([SubnetUsage(250, 254), SubnetUsage(100, 126)], test.subnets_usage)
+        self.assertEqual(SubnetUsage(100, 126), test.subnet_usage(1))
+
+    def test_ips_in_subnets(self):
+        test = init_cidr([1500, 250], '192.168.0.0/18')
+        ips = ['192.168.0.0', '192.168.7.255', '192.168.8.0', '192.168.8.255', '192.168.9.0', '10.0.0.1']
+
+        self.assertEqual([True, True, True, True, False, False], test.ips_in_subnets(ips).tolist())
+
+        test.remove_subnet(0)
+        self.assertEqual([False, False, True, True, False, False], test.ips_in_subnets(ips).tolist())
+
+    def test_classify_in_subnets(self):
+        test = init_cidr([1500, 250], '192.168.0.0/18')
+        ips = ['192.168.0.0', '192.168.3.3', '192.168.7.255', '192.168.8.0', '192.168.8.255', '192.168.9.0']
+
+        types, indexes = test.classify_in_subnets(ips)
+        self.assertEqual([0, 1, 2, 0, 2, 3], types.tolist())
+        self.assertEqual([0, 0, 0, 1, 1, -1], indexes.tolist())
+
+        types, indexes = test.classify_in_subnets([])
+        self.assertEqual(([], []), (types.tolist(), indexes.tolist()))
+
+    def test_classify_without_subnets(self):
+        ips = ['192.168.0.0', '192.168.3.3', '10.0.0.1']
+        emptied = init_cidr([100], '192.168.0.0/24')
+        emptied.remove_subnet(0)
+
+        for test in (IPv4NetworkCompound(), emptied):
+            types, indexes = test.classify_in_subnets(ips)
+            self.assertEqual([3, 3, 3], types.tolist())
+            self.assertEqual([-1, -1, -1], indexes.tolist())
+
     def test_property_activated(self):
         test = IPv4NetworkCompound().init_from_cidr('192.168.1.0/23')
         self.assertEqual(False, test.activated)
@@ -137,3 +305,55 @@ class IPv4NetworkCompoundDisplays(unittest.TestCase):
             m.call("Network usage:"),
             m.call("[██████████████████░░] 87 %")
         ], mocked_print.mock_calls)
+
+
+class IPv4NetworkCompoundNesting(unittest.TestCase):
+
+    def setUp(self):
+        self.region = init_cidr([4000, 4000, 1000], '10.0.0.0/16')
+        self.site = self.region.subdivide(0, [250, 250, 100])
+
+    def test_subdivide(self):
+        self.assertIs(self.site, self.region.subnets[0])
+        self.assertIs(self.region, self.site.parent)
+        self.assertEqual('10.0.0.0/20', f"{self.site.displayable_network_range['start']}/{self.site.mask_length}")
+
+        self.assertEqual(5, self.region.leaf_count)
+        self.assertEqual(4000 + 1000 + 600, self.region.tree_requested)
+        self.assertEqual(3, self.site.leaf_count)
+
+        self.assertRaises(ValueError, lambda: self.region.subdivide(0, [10]))
+        self.assertRaises(MaskTooSmallException, lambda: self.region.subdivide(2, [2000]))
+
+    def test_roll_up(self):
+        vlan = self.site.subdivide(1, [20, 20])
+        self.assertEqual(6, self.region.leaf_count)
+        self.assertEqual(4000 + 1000 + 250 + 100 + 40, self.region.tree_requested)
+
+        vlan.add_from_addresses(10, stable=True)
+        self.site.remove_subnet(0)
+        self.assertEqual((6, 4000 + 1000 + 100 + 50), (self.region.leaf_count, self.region.tree_requested))
+
+        self.region.remove_subnet(0)
+        self.assertIsNone(self.site.parent)
+        self.assertEqual((2, 5000), (self.region.leaf_count, self.region.tree_requested))
+
+    def test_resolve(self):
+        vlan = self.site.subdivide(1, [20, 20])
+
+        self.assertIs(vlan.subnets[1], self.region.resolve('10.0.1.40'))
+        self.assertIs(self.site.subnets[0], self.region.resolve('10.0.0.7'))
+        self.assertIs(self.region.subnets[1], self.region.resolve('10.0.16.1'))
+        self.assertIsNone(self.region.resolve('10.0.1.200'))
+        self.assertIsNone(self.region.resolve('10.0.2.200'))
+
+    def test_iter_leaves(self):
+        self.site.subdivide(1, [20, 20])
+        leaves = [n.displayable_network_range['start'] for n in self.region.iter_leaves()]
+
+        self.assertEqual(['10.0.0.0', '10.0.1.0', '10.0.1.32', '10.0.2.0', '10.0.16.0', '10.0.32.0'], leaves)
+
+    def test_rebuild_with_subdivided_subnets(self):
+        self.assertRaises(ValueError, lambda: self.region.add_from_addresses(10))
+        self.region.add_from_addresses(10, stable=True)
+        self.assertEqual(6, self.region.leaf_count)
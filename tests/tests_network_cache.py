@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import unittest
+from nettools import *
+
+
+class NetworkCacheTests(unittest.TestCase):
+
+    def test_lru(self):
+        cache = NetworkCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(['a', 'c'], [k for k in 'abc' if k in cache])
+        self.assertEqual({"hits": 1, "misses": 0, "evictions": 1, "size": 2, "maxsize": 2}, cache.stats)
+
+    def test_fifo(self):
+        cache = NetworkCache(2, eviction='fifo')
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(['b', 'c'], [k for k in 'abc' if k in cache])
+
+    def test_misses_and_clear(self):
+        cache = NetworkCache(2)
+        self.assertEqual(None, cache.get('a'))
+        self.assertEqual(1, cache.misses)
+
+        cache.put('a', 1)
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.misses)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, lambda: NetworkCache(0))
+        self.assertRaises(ValueError, lambda: NetworkCache(2, eviction='random'))
+
+    def test_cli_rejects_empty_cache(self):
+        for size in ('0', '-1'):
+            run = subprocess.run([sys.executable, '-m', 'nettools', '--cache', size, 'network', '10.0.0.1', '8'],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            self.assertEqual(2, run.returncode)
+            self.assertIn("argument --cache: expected a number of at least 1", run.stderr)
+
+
+class IPv4NetworkCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = IPv4Network.enable_cache(16)
+
+    def tearDown(self):
+        IPv4Network.disable_cache()
+
+    def test_normalized_hits(self):
+        first = IPv4Network().init_from_cidr('192.168.1.4/24')
+        second = IPv4Network().init_from_couple('192.168.1.4', '255.255.255.0')
+        third = IPv4Network().init_from_int(0xC0A80104, 24)
+
+        self.assertEqual(1, self.cache.misses)
+        self.assertEqual(2, self.cache.hits)
+        for net in (second, third):
+            self.assertEqual(first.displayable_network_range, net.displayable_network_range)
+            self.assertEqual(first.mask_length, net.mask_length)
+            self.assertEqual(first.addresses, net.addresses)
+            self.assertEqual(first.displayable_address_type, net.displayable_address_type)
+            self.assertEqual(str(first.mask), str(net.mask))
+
+    def test_instances_are_not_shared(self):
+        first = IPv4Network().init_from_cidr('192.168.1.4/24')
+        second = IPv4Network().init_from_cidr('192.168.1.4/24')
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.network_range, second.network_range)
+
+    def test_errors_not_cached(self):
+        self.assertRaises(RFCRulesIPWrongRangeException, lambda: IPv4Network().init_from_cidr('8.8.8.8/24'))
+        self.assertRaises(RFCRulesIPWrongRangeException, lambda: IPv4Network().init_from_cidr('8.8.8.8/24'))
+        self.assertRaises(MaskLengthOffBoundsException, lambda: IPv4Network().init_from_cidr('10.0.0.0/33'))
+        self.assertEqual(0, len(self.cache))
+
+    def test_compound(self):
+        IPv4NetworkCompound().init_from_cidr('192.168.0.0/18').add_from_addresses([250, 250])
+        test = IPv4NetworkCompound().init_from_cidr('192.168.0.0/18').add_from_addresses([250, 250])
+
+        self.assertEqual(3, self.cache.hits)
+        self.assertEqual([{'start': '192.168.0.0', 'end': '192.168.0.255'},
+                          {'start': '192.168.1.0', 'end': '192.168.1.255'}], test.displayable_subnetworks)
@@ -0,0 +1,49 @@
+import unittest
+from nettools import *
+from nettools import OverlapIndex
+
+
+class OverlapIndexTests(unittest.TestCase):
+
+    @staticmethod
+    def index():
+        return OverlapIndex([
+            '10.0.0.0/8',                                   # 0
+            '10.1.0.0/16',                                  # 1
+            IPv4Network().init_from_cidr('10.1.2.0/24'),    # 2
+            '192.168.0.0/24',                               # 3
+            FrozenIPv4Network.from_cidr('10.1.0.0/16'),     # 4
+            '172.16.0.0/12',                                # 5
+        ])
+
+    def test_report(self):
+        report = self.index().report()
+
+        self.assertEqual([(1, 4)], report.duplicates)
+        self.assertEqual(sorted([(0, 1), (0, 4), (0, 2), (1, 2), (4, 2)]), sorted(report.containments))
+        self.assertEqual(6, len(report.overlaps))
+
+    def test_check(self):
+        index = self.index()
+
+        conflicts = index.check('10.1.0.0/16')
+        self.assertEqual([1, 4], conflicts.duplicates)
+        self.assertEqual([0], conflicts.containers)
+        self.assertEqual([2], conflicts.contained)
+
+        self.assertFalse(index.check('192.168.1.0/24'))
+        self.assertEqual([3], index.check('192.168.0.0/16').contained)
+
+    def test_insert(self):
+        index = OverlapIndex()
+
+        self.assertFalse(index.insert('10.0.0.0/16', 'team-a'))
+        conflicts = index.insert('10.0.5.0/24', 'team-b')
+
+        self.assertEqual([0], conflicts.containers)
+        self.assertEqual((FrozenIPv4Network.from_cidr('10.0.0.0/16'), 'team-a'), index.entry(0))
+        self.assertEqual(2, len(index))
+
+    def test_disjoint(self):
+        report = OverlapIndex(['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/23']).report()
+        self.assertEqual([], report.overlaps)
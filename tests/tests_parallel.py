@@ -0,0 +1,70 @@
+import io
+import json
+import subprocess
+import sys
+import unittest
+from nettools import *
+from nettools.core.batch import run_batch
+from nettools.core.parallel import iter_chunks, ordered_map, compounds_parallel
+from nettools.utils.ip_class import literal_to_int, int_to_literal
+
+
+class ParallelTests(unittest.TestCase):
+
+    def test_iter_chunks(self):
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6]], list(iter_chunks(range(7), 3)))
+        self.assertEqual([], list(iter_chunks([], 3)))
+
+    def test_ordered_map(self):
+        tasks = [(i, 2) for i in range(50)]
+        expected = [i ** 2 for i in range(50)]
+
+        self.assertEqual(expected, list(ordered_map(pow, iter(tasks), jobs=1)))
+        self.assertEqual(expected, list(ordered_map(pow, iter(tasks), jobs=3)))
+        self.assertRaises(ValueError, list, ordered_map(pow, iter(tasks), jobs=0))
+
+    def test_compounds(self):
+        networks = [(literal_to_int('10.0.0.0'), 16), (literal_to_int('192.168.0.0'), 24),
+                    (literal_to_int('192.168.0.0'), 24), (literal_to_int('8.8.8.0'), 24)]
+        sizes = [[100, 200], [500], [50, 50], [10]]
+
+        for jobs in (1, 2):
+            starts, lengths, offsets, failed = compounds_parallel(networks, sizes, jobs=jobs, chunk_size=2)
+
+            self.assertEqual([0, 2, 2, 4, 4], offsets.tolist())
+            self.assertEqual([False, True, False, True], failed.tolist())
+            self.assertEqual(['10.0.0.0', '10.0.1.0', '192.168.0.0', '192.168.0.64'],
+                             [int_to_literal(s) for s in starts.tolist()])
+            self.assertEqual([24, 25, 26, 26], lengths.tolist())
+
+    def test_batch_jobs(self):
+        lines = [f"192.168.{i % 256}.{i % 200} {16 + i % 15}" for i in range(500)]
+        lines += ['bad line', 'builder 10.0.0.0/8 5']
+
+        expected, expected_errors = io.StringIO(), io.StringIO()
+        run_batch(lines, expected, 'csv', expected_errors)
+
+        output, errors = io.StringIO(), io.StringIO()
+        self.assertEqual(1, run_batch(lines, output, 'csv', errors, jobs=2, chunk_size=64, cache_size=16))
+        self.assertEqual(expected.getvalue(), output.getvalue())
+        self.assertEqual(expected_errors.getvalue(), errors.getvalue())
+        self.assertTrue(errors.getvalue().startswith('line 501: '))
+        self.assertRaises(ValueError, run_batch, lines, io.StringIO(), jobs=-1)
+
+    def test_batch_jobs_line_numbers(self):
+        # \x0c and \r are line boundaries for str.splitlines, not for the batch input
+        lines = ['10.0.0.0/8\x0c', 'bad', '192.168.1.0/24 \r']
+
+        expected, expected_errors = io.StringIO(), io.StringIO()
+        run_batch(lines, expected, 'ndjson', expected_errors)
+
+        output, errors = io.StringIO(), io.StringIO()
+        run_batch(lines, output, 'ndjson', errors, jobs=2, chunk_size=2)
+        self.assertEqual(expected.getvalue(), output.getvalue())
+        self.assertEqual(expected_errors.getvalue(), errors.getvalue())
+        self.assertEqual([1, 3], [json.loads(record)['line'] for record in output.getvalue().splitlines()])
+        self.assertTrue(errors.getvalue().startswith('line 2: '))
+
+    def test_batch_does_not_import_numpy(self):
+        code = "import sys, nettools.core.batch; print('numpy' in sys.modules)"
+        self.assertEqual('False', subprocess.check_output([sys.executable, '-c', code], text=True).strip())
@@ -0,0 +1,98 @@
+import io
+import json
+import unittest
+import unittest.mock as m
+from nettools import *
+from nettools.core import renderers
+
+
+def init_cidr(sizes, cidr):
+    return IPv4NetworkCompound().init_from_cidr(cidr).add_from_addresses(sizes)
+
+
+class CountingStream(io.StringIO):
+    writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class RenderersTests(unittest.TestCase):
+
+    def setUp(self):
+        self.compound = init_cidr([1500, 5000, 3680], '192.168.1.0/18')
+
+    def test_text_matches_fancy_display(self):
+        for advanced in (False, True):
+            with m.patch('builtins.print') as mocked_print:
+                self.compound.print_subnetworks_fancy(advanced)
+            printed = ''.join(call[1][0] + '\n' for call in mocked_print.mock_calls)
+
+            stream = io.StringIO()
+            self.compound.write_subnetworks(stream, advanced=advanced)
+            self.assertEqual(printed, stream.getvalue())
+
+    def test_json(self):
+        stream = io.StringIO()
+        self.compound.write_subnetworks(stream, 'json')
+        document = json.loads(stream.getvalue())
+
+        self.assertEqual('192.168.0.0/18', document['network'])
+        self.assertEqual(16382, document['addresses'])
+        self.assertEqual({'start': '192.168.32.0', 'end': '192.168.47.255', 'mask_length': 20, 'available': 4094,
+                          'requested': 3680}, document['subnets'][1])
+
+    def test_ndjson(self):
+        stream = io.StringIO()
+        self.compound.write_subnetworks(stream, 'ndjson')
+        lines = stream.getvalue().splitlines()
+
+        self.assertEqual(3, len(lines))
+        self.assertEqual('192.168.48.0', json.loads(lines[2])['start'])
+
+    def test_csv(self):
+        stream = io.StringIO()
+        self.compound.write_subnetworks(stream, 'csv')
+
+        self.assertEqual([
+            'start,end,mask_length,available,requested',
+            '192.168.0.0,192.168.31.255,19,8190,5000',
+            '192.168.32.0,192.168.47.255,20,4094,3680',
+            '192.168.48.0,192.168.55.255,21,2046,1500'
+        ], stream.getvalue().splitlines())
+
+    def test_buffered_writes(self):
+        compound = init_cidr([2] * 5000, '10.0.0.0/16')
+        stream = CountingStream()
+        written = renderers.render(compound, stream, 'ndjson', buffer_size=1 << 14)
+
+        self.assertEqual(len(stream.getvalue()), written)
+        self.assertEqual(5000, len(stream.getvalue().splitlines()))
+        self.assertLess(stream.writes, 50)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, lambda: self.compound.write_subnetworks(io.StringIO(), 'xml'))
+
+    def test_not_activated(self):
+        for compound in (IPv4NetworkCompound(), IPv4NetworkCompound().init_from_cidr('192.168.0.0/24')):
+            for fmt in ('text', 'ndjson'):
+                stream = io.StringIO()
+                compound.write_subnetworks(stream, fmt)
+                self.assertEqual('', stream.getvalue())
+
+            stream = io.StringIO()
+            compound.write_subnetworks(stream, 'csv')
+            self.assertEqual('start,end,mask_length,available,requested\n', stream.getvalue())
+
+        stream = io.StringIO()
+        IPv4NetworkCompound().write_subnetworks(stream, 'json')
+        self.assertEqual('', stream.getvalue())
+
+        stream = io.StringIO()
+        IPv4NetworkCompound().init_from_cidr('192.168.0.0/24').write_subnetworks(stream, 'json')
+        self.assertEqual({'network': '192.168.0.0/24', 'addresses': 254, 'subnets': []}, json.loads(stream.getvalue()))
+
+    def test_usage_graph(self):
+        self.assertEqual('[' + '█' * 18 + '░' * 2 + '] 87 %', renderers.usage_graph(87))
+        self.assertEqual('[' + '░' * 20 + '] 0 %', renderers.usage_graph(0))
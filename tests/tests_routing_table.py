@@ -0,0 +1,75 @@
+import unittest
+from nettools import *
+from nettools import RoutingTable
+
+
+class RoutingTableTests(unittest.TestCase):
+
+    @staticmethod
+    def table():
+        table = RoutingTable()
+        table.insert('0.0.0.0/0', 'default')
+        table.insert('10.0.0.0/8', 'corp')
+        table.insert(IPv4Network().init_from_cidr('10.1.0.0/16'), 'site')
+        table.insert(FrozenIPv4Network.from_cidr('10.1.2.0/24'), 'vlan')
+        return table
+
+    def test_lookup(self):
+        table = self.table()
+
+        self.assertEqual('vlan', table.lookup('10.1.2.3'))
+        self.assertEqual('site', table.lookup('10.1.3.3'))
+        self.assertEqual('corp', table.lookup(int(IPv4Address.from_literal('10.2.0.0'))))
+        self.assertEqual('default', table.lookup('8.8.8.8'))
+        self.assertEqual((FrozenIPv4Network.from_cidr('10.1.0.0/16'), 'site'), table.lookup_route('10.1.255.255'))
+
+    def test_no_match(self):
+        table = RoutingTable()
+        table.insert('10.0.0.0/8', 'corp')
+
+        self.assertEqual(None, table.lookup('11.0.0.0'))
+        self.assertEqual([-1], table.lookup_batch(['11.0.0.0']).tolist())
+
+    def test_lookup_batch(self):
+        table = self.table()
+        ips = ['10.1.2.3', '10.1.3.3', '10.2.0.0', '8.8.8.8', '10.1.2.255']
+
+        self.assertEqual(['vlan', 'site', 'corp', 'default', 'vlan'], table.lookup_payloads(ips))
+        self.assertEqual([table.lookup_route(ip) for ip in ips], [table.route(i) for i in table.lookup_batch(ips)])
+
+    def test_lookup_batch_bounds(self):
+        table = self.table()
+        table.insert('255.255.255.255/32', 'top')
+        ips = ['0.0.0.0', '9.255.255.255', '10.0.0.0', '10.1.1.255', '10.1.2.0', '10.1.2.255', '10.1.3.0',
+               '10.255.255.255', '11.0.0.0', '255.255.255.254', '255.255.255.255']
+
+        self.assertEqual([table.lookup(ip) for ip in ips], table.lookup_payloads(ips))
+        self.assertEqual(['default', 'default', 'corp', 'site', 'vlan', 'vlan', 'site', 'corp', 'default', 'default',
+                          'top'], table.lookup_payloads(ips))
+
+        table.insert('10.1.2.128/25', 'half')
+        self.assertEqual(['vlan', 'half'], table.lookup_payloads(['10.1.2.127', '10.1.2.128']))
+        self.assertEqual([], table.lookup_batch([]).tolist())
+        self.assertEqual([-1], RoutingTable().lookup_batch(['10.0.0.0']).tolist())
+
+    def test_insert_replaces(self):
+        table = self.table()
+        route_id = table.insert('10.1.2.0/24', 'other')
+
+        self.assertEqual(4, len(table))
+        self.assertEqual('other', table.lookup('10.1.2.3'))
+        self.assertEqual([route_id], table.lookup_batch(['10.1.2.3']).tolist())
+
+    def test_delete(self):
+        table = self.table()
+        table.lookup_batch(['10.1.2.3'])
+
+        self.assertEqual('vlan', table.delete('10.1.2.0/24'))
+        self.assertNotIn('10.1.2.0/24', table)
+        self.assertEqual('site', table.lookup('10.1.2.3'))
+        self.assertEqual(['site'], table.lookup_payloads(['10.1.2.3']))
+        self.assertRaises(KeyError, lambda: table.delete('10.1.2.0/24'))
+
+    def test_iter(self):
+        self.assertEqual(['0.0.0.0/0', '10.0.0.0/8', '10.1.0.0/16', '10.1.2.0/24'],
+                         [str(net) for net, _ in self.table()])
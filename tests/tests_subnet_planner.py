@@ -0,0 +1,103 @@
+import unittest
+import unittest.mock as m
+import numpy as np
+from nettools import *
+from nettools import plan_subnets, plan_capacities
+from nettools.core import subnet_planner
+
+
+class SubnetPlannerTests(unittest.TestCase):
+
+    def test_single_pool_packs_largest_first(self):
+        plan = plan_subnets(['192.168.0.0/22'], [100, 500, 20])
+
+        self.assertEqual(['192.168.2.0/25', '192.168.0.0/23', '192.168.2.128/27'], [str(n) for n in plan.assignments])
+        self.assertEqual([], plan.unplaced)
+        self.assertEqual(126 - 100 + 510 - 500 + 30 - 20, plan.wasted)
+
+    def test_best_fit_across_pools(self):
+        plan = plan_subnets(['10.0.0.0/16', '192.168.0.0/24'], [200, 1000], time_budget=0)
+
+        # The /24 request fills the small pool instead of cutting the large one
+        self.assertEqual(['192.168.0.0/24', '10.0.0.0/22'], [str(n) for n in plan.assignments])
+
+    def test_search_keeps_the_best_plan(self):
+        pools = ['10.0.0.0/24', '10.0.4.0/23']
+        sizes = [100, 50]
+
+        with m.patch.object(subnet_planner, '_place', wraps=subnet_planner._place) as place:
+            greedy = plan_subnets(pools, sizes, time_budget=0)
+            self.assertEqual(1, place.call_count)
+
+            # The greedy placement, then one placement per preference order of the two pools
+            place.reset_mock()
+            searched = plan_subnets(pools, sizes, time_budget=1)
+            self.assertEqual(1 + 2, place.call_count)
+
+        # The best fit placement leaves the /23 pool whole, no preference order does better
+        self.assertEqual(['10.0.0.0/25', '10.0.0.128/26'], [str(n) for n in searched.assignments])
+        self.assertAlmostEqual(1 / 9, searched.fragmentation)
+        self.assertEqual(greedy, searched)
+
+    def test_unplaced_requests(self):
+        plan = plan_subnets(['192.168.0.0/24', '192.168.1.0/25'], [300, 200, 100, 100])
+
+        self.assertEqual([0, 3], plan.unplaced)
+        self.assertIsNone(plan.assignments[0])
+        self.assertEqual(['192.168.0.0/24', '192.168.1.0/25'], [str(n) for n in plan.assignments[1:3]])
+
+    def test_errors(self):
+        self.assertRaises(ValueError, lambda: plan_subnets(['10.0.0.0/24'], [10, -1]))
+
+    def test_adjacent_pools_are_merged(self):
+        plan = plan_subnets(['192.168.0.0/24', '192.168.1.0/24'], [500])
+        self.assertEqual(['192.168.0.0/23'], [str(n) for n in plan.assignments])
+        self.assertEqual(0, plan.fragmentation)
+
+
+class CapacityPlannerTests(unittest.TestCase):
+
+    def test_lists(self):
+        plan = plan_capacities([[250, 100], [], [2, 1, 0], [1000] * 5])
+
+        self.assertEqual([0, 2, 2, 5, 10], plan.offsets.tolist())
+        self.assertEqual([24, 25, 30, 30, 31], plan.prefix_lengths[:5].tolist())
+        self.assertEqual([384, 0, 10, 5120], plan.block_sizes.tolist())
+        self.assertEqual([23, 31, 28, 19], plan.parent_prefixes.tolist())
+
+    def test_flat_array(self):
+        sizes = np.array([250, 100, 2, 1, 0])
+        plan = plan_capacities(sizes, np.array([0, 2, 5]))
+
+        self.assertEqual([384, 10], plan.block_sizes.tolist())
+        self.assertEqual([23, 28], plan.parent_prefixes.tolist())
+
+    def test_matches_compound(self):
+        sizes = [250, 60, 1000, 12]
+        plan = plan_capacities([sizes])
+        compound = IPv4NetworkCompound().init_from_cidr('10.0.0.0/16').add_from_addresses(sizes)
+
+        self.assertEqual(sorted(n.mask_length for n in compound.subnets), sorted(plan.prefix_lengths.tolist()))
+
+    def test_parent_prefix_builds_compound(self):
+        lists = [[250], [100, 100], [200, 450], [1000, 500, 250, 120, 60, 30, 14], [5000, 5000, 3]]
+        plan = plan_capacities(lists)
+
+        self.assertEqual([24, 24, 22, 21, 17], plan.parent_prefixes.tolist())
+        for sizes, prefix, total in zip(lists, plan.parent_prefixes.tolist(), plan.block_sizes.tolist()):
+            compound = IPv4NetworkCompound().init_from_cidr(f'10.0.0.0/{prefix}').add_from_addresses(sizes)
+            self.assertEqual(len(sizes), len(compound.subnets))
+
+            self.assertTrue(Utils.blocks_fit(total, prefix))
+            self.assertFalse(Utils.blocks_fit(total, prefix + 1))
+            self.assertRaises(MaskTooSmallException,
+                              lambda: IPv4NetworkCompound().init_from_cidr(f'10.0.0.0/{prefix + 1}')
+                              .add_from_addresses(sizes))
+
+    def test_too_large(self):
+        plan = plan_capacities([[2 ** 31] * 2])
+        self.assertEqual([-1], plan.parent_prefixes.tolist())
+
+    def test_errors(self):
+        self.assertRaises(ValueError, lambda: plan_capacities([[-1]]))
+        self.assertRaises(ValueError, lambda: plan_capacities(np.array([1, 2]), np.array([0, 1])))
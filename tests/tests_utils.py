@@ -1,5 +1,9 @@
+import subprocess
+import sys
 import unittest
+import nettools
 from nettools import *
+from nettools import IPv4AddressArray
 
 
 def content(x, tweak=None):
@@ -46,3 +50,36 @@ class UtilsTests(unittest.TestCase):
 
         self.assertEqual(True, self.c.ip_in_range(netr, in_r), msg="In range")
         self.assertEqual(False, self.c.ip_in_range(netr, out_r), msg="Not in range")
+
+    def test_ip_in_range_large(self):
+        netr = {
+            "start": FourBytesLiteral().set_eval('10.0.0.0'),
+            "end": FourBytesLiteral().set_eval('10.255.255.255')
+        }
+
+        self.assertEqual(True, self.c.ip_in_range(netr, FourBytesLiteral().set_eval('10.200.3.4')))
+        self.assertEqual(False, self.c.ip_in_range(netr, IPv4Address.from_literal('11.0.0.0')))
+
+    def test_ips_in_range(self):
+        netr = IPv4Network().init_from_cidr('192.168.1.0/24').network_range
+        ips = ['192.168.1.4', '192.168.4.0', '192.168.1.255', '192.168.0.255']
+        expected = [True, False, True, False]
+
+        self.assertEqual(expected, self.c.ips_in_range(netr, ips).tolist())
+        self.assertEqual(expected, self.c.ips_in_range(netr, IPv4AddressArray().init_from_literals(ips)).tolist())
+        self.assertEqual(expected, self.c.ips_in_range(netr, (IPv4Address.from_literal(i) for i in ips)).tolist())
+
+    def test_required_machine_bits(self):
+        self.assertEqual([1, 2, 8, 8, 9], [self.c.required_machine_bits(s) for s in (0, 1, 250, 254, 255)])
+
+    def test_required_mask_length(self):
+        self.assertEqual([31, 31, 24, 23, 0], [self.c.required_mask_length(t) for t in (1, 2, 256, 257, 2 ** 32)])
+        self.assertIsNone(self.c.required_mask_length(2 ** 32 + 1))
+
+    def test_numpy_is_imported_lazily(self):
+        code = "import sys, nettools, nettools.__main__; from nettools import *; print('numpy' in sys.modules)"
+        self.assertEqual('False', subprocess.check_output([sys.executable, '-c', code], text=True).strip())
+
+        self.assertIs(IPv4AddressArray, nettools.IPv4AddressArray)
+        self.assertIn('BulkParser', dir(nettools))
+        self.assertRaises(AttributeError, getattr, nettools, 'NotAName')